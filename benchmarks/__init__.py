@@ -0,0 +1,8 @@
+"""Benchmarks for pagable. Run from the repository root, e.g.::
+
+    $ python -m benchmarks.mapping -n 1000
+
+Or run the whole suite, saving the results to compare them later::
+
+    $ python -m benchmarks.suite --compare benchmarks/results/abc1234.json
+"""
@@ -0,0 +1,115 @@
+"""Microbenchmark: memory held per idle websocket connection.
+
+"before" recreates the per-connection state of the previous handler
+(closures, lists and lambdas), kept here for comparison; "after" is the
+current :class:`Connection`. Both include the channel and the broadcast
+subscription, and neither includes the handler's own coroutine frame, which
+is the same for both.
+"""
+import argparse
+import asyncio
+import gc
+import tracemalloc
+
+from pagable.backend.broadcast import Broadcaster
+from pagable.backend.connections import ConnectionTable
+from pagable.backend.serialize import Channel
+
+
+def legacy(broadcaster: Broadcaster, ws, route: str, params: dict):
+    """The previous per-connection state of ``App._ws_handler``."""
+    channel = Channel(ws)
+    channel.route = route
+    state = []
+    rendered = []
+    lock = asyncio.Lock()
+
+    def set_ctnt(val):
+        state.clear()
+        state.append(val)
+
+    async def update(route: str, *, initial: bool = False):
+        async with lock:
+            await render_update(route, initial=initial)
+
+    async def render_update(route: str, *, initial: bool = False):
+        set_ctnt((channel, params, rendered))
+
+    subscriber = broadcaster.subscribe(
+        route,
+        lambda: update(route),
+        lambda: ws.close(code=1013)
+    )
+    return (channel, state, rendered, subscriber)
+
+
+def current(
+    broadcaster: Broadcaster,
+    table: ConnectionTable,
+    ws,
+    route: str,
+    params: dict
+):
+    channel = Channel(ws)
+    channel.route = route
+    conn = table.open(None, channel, route, params)
+    conn.subscriber = broadcaster.subscribe(route, conn.update, conn.shed)
+    return conn
+
+
+def measure(func, connections: int) -> float:
+    """Opens ``connections`` connections; returns bytes per connection."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    held = [func(index) for index in range(connections)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return (after - before) / connections
+
+
+async def compare(connections: int) -> dict:
+    ws = object()
+    params = {"id": "1"}
+
+    broadcaster = Broadcaster()
+    before = measure(
+        lambda index: legacy(broadcaster, ws, "/users/[id]", params),
+        connections
+    )
+
+    broadcaster = Broadcaster()
+    table = ConnectionTable()
+    after = measure(
+        lambda index: current(broadcaster, table, ws, "/users/[id]", params),
+        connections
+    )
+
+    return {
+        "connections": connections,
+        "before_bytes": before,
+        "after_bytes": after,
+    }
+
+
+def run(connections: int = 10_000) -> dict:
+    """Returns bytes held per idle connection, before and after."""
+    return asyncio.run(compare(connections))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--connections", type=int, default=10_000)
+    args = parser.parse_args()
+
+    result = run(args.connections)
+    print(
+        f"{result['connections']} connections: "
+        f"before {result['before_bytes']:.0f} bytes, "
+        f"after {result['after_bytes']:.0f} bytes per connection"
+    )
+
+
+if __name__ == "__main__":
+    main()
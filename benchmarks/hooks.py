@@ -0,0 +1,76 @@
+"""Microbenchmark: per-hook overhead of ``get_component`` and ``use_state``.
+
+"before" is the previous ``inspect.stack()`` lookup, kept here for
+comparison; "after" is the current context variable lookup.
+"""
+import argparse
+import asyncio
+import inspect
+import time
+
+from pagable import Component, get_component, use_state
+
+
+def stack_lookup() -> Component:
+    """The previous implementation of ``get_component()``."""
+    for stack in inspect.stack()[1:]:
+        _locals = stack[0].f_locals
+        if 'self' in _locals and isinstance(_locals['self'], Component):
+            return _locals['self']
+
+    raise TypeError
+
+
+def nested(depth: int, func):
+    # hooks are usually called a few frames below the handler
+    if depth:
+        return nested(depth - 1, func)
+
+    return func()
+
+
+def per_call(func, calls: int, depth: int) -> float:
+    """Runs ``func`` inside a render; returns seconds per call."""
+    result = {}
+
+    async def handle():
+        start = time.perf_counter()
+        for _ in range(calls):
+            nested(depth, func)
+        result['time'] = time.perf_counter() - start
+        return ""
+
+    asyncio.run(Component(handle)())
+    return result['time'] / calls
+
+
+def run(calls: int = 2_000, depth: int = 5) -> dict:
+    """Returns per-call overhead in microseconds."""
+    return {
+        "calls": calls,
+        "depth": depth,
+        "get_component_before_us": per_call(stack_lookup, calls, depth) * 1e6,
+        "get_component_after_us": per_call(get_component, calls, depth) * 1e6,
+        "use_state_us": per_call(
+            lambda: use_state("count", 0), calls, depth
+        ) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--calls", type=int, default=2_000)
+    parser.add_argument("-d", "--depth", type=int, default=5)
+    args = parser.parse_args()
+
+    result = run(args.calls, args.depth)
+    before = result['get_component_before_us']
+    after = result['get_component_after_us']
+    print(
+        f"get_component: before {before:.2f}us, after {after:.3f}us "
+        f"({before / after:.0f}x); use_state {result['use_state_us']:.3f}us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: idle CPU time and memory growth of an app, per mode.
+
+Each mode runs in its own process, from a project directory (one with
+``index.html`` and ``src/``), with the app's lifespan started and no
+traffic.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+
+def rss_kb() -> int:
+    """Current resident set size, in KiB (Linux)."""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+async def idle(mode: str, seconds: float) -> dict:
+    from pagable.backend.core import App
+
+    app = App(mode=mode) # type: ignore
+
+    async with app._lifespan(app.app):
+        # let startup work settle first
+        await asyncio.sleep(1)
+        rss = rss_kb()
+        cpu = time.process_time()
+
+        await asyncio.sleep(seconds)
+
+        return {
+            "mode": mode,
+            "seconds": seconds,
+            "cpu_ms": (time.process_time() - cpu) * 1e3,
+            "rss_growth_kb": rss_kb() - rss,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+
+
+def run(seconds: float = 10.0) -> list:
+    """Returns idle costs of each mode, measured in child processes."""
+    results = []
+
+    for mode in ("dev", "production"):
+        output = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.idle",
+                "--child", mode, "-s", str(seconds)
+            ],
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-s", "--seconds", type=float, default=10.0)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(idle(args.child, args.seconds))))
+        return
+
+    for result in run(args.seconds):
+        print(
+            f"{result['mode']:>10}: {result['cpu_ms']:.1f}ms CPU, "
+            f"{result['rss_growth_kb']}KiB RSS growth over "
+            f"{result['seconds']:.0f}s (max RSS {result['max_rss_kb']}KiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""End-to-end load test: N concurrent websocket clients against an App.
+
+Clients are driven in-process through the ASGI interface (no network, no
+extra dependencies). Measures the initial render latency, ``Script.run``
+round trips per second, and memory per idle connection. Runs in a temporary
+project directory with generated pages.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+TABLE_PAGE = """from pagable import html
+
+
+async def handle():
+    return html.table(
+        html.tbody([
+            html.tr([html.td(str(i)), html.td(f"row {{i}}")], key=str(i))
+            for i in range({rows})
+        ])
+    )
+"""
+
+SCRIPTING_PAGE = """from pagable.frontend_api import Script
+
+
+async def handle():
+    script = Script()
+    for _ in range({rounds}):
+        await script.run("return 1")
+
+    return "done"
+"""
+
+INDEX = '<html><head><title>bench</title></head><body>' \
+    '<div id="root"></div></body></html>'
+
+
+class Client:
+    """Represents an in-process websocket client of an ASGI app."""
+
+    def __init__(self, app, path: str = "/__WS__"):
+        self.app = app
+        self.path = path
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.outgoing: asyncio.Queue = asyncio.Queue()
+        self.task = None
+
+    async def connect(self):
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+            "subprotocols": [],
+        }
+        await self.outgoing.put({"type": "websocket.connect"})
+        self.task = asyncio.create_task(
+            self.app(scope, self.outgoing.get, self.incoming.put)
+        )
+        message = await self.incoming.get()
+        assert message["type"] == "websocket.accept", message
+
+    async def send(self, data: dict):
+        await self.outgoing.put({
+            "type": "websocket.receive",
+            "text": json.dumps(data)
+        })
+
+    async def receive(self) -> dict:
+        message = await self.incoming.get()
+        if message["type"] == "websocket.close":
+            raise ConnectionError(message.get("code"))
+
+        return json.loads(message.get("bytes") or message["text"])
+
+    async def open(self, page: str) -> dict:
+        """Opens a page; answers scriptings until the first render."""
+        await self.send({"path": page})
+
+        while True:
+            data = await self.receive()
+            if data["type"] == 2 and data["id"] is not None:
+                await self.send({"type": 2, "id": data["id"], "ctnt": None})
+            elif data["type"] == 1:
+                return data
+
+    async def close(self):
+        await self.outgoing.put(
+            {"type": "websocket.disconnect", "code": 1000}
+        )
+        if self.task is not None:
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(self.task, 5)
+
+
+def project(root: str, rows: int, rounds: int):
+    pages = os.path.join(root, "src", "pages")
+    for directory in ("pages", "scripts", "styles"):
+        os.makedirs(os.path.join(root, "src", directory), exist_ok=True)
+
+    with open(os.path.join(pages, "table.py"), "w") as f:
+        f.write(TABLE_PAGE.format(rows=rows))
+
+    with open(os.path.join(pages, "scripting.py"), "w") as f:
+        f.write(SCRIPTING_PAGE.format(rounds=rounds))
+
+    with open(os.path.join(root, "index.html"), "w") as f:
+        f.write(INDEX)
+
+
+async def measure(clients: int, rounds: int) -> dict:
+    from pagable.backend.core import App
+
+    app = App(mode="production", diagnostics=False, log_level="error").app
+
+    # initial render latency, all clients at once
+    async def render() -> float:
+        client = Client(app)
+        await client.connect()
+        start = time.perf_counter()
+        await client.open("/table/")
+        elapsed = time.perf_counter() - start
+        await client.close()
+        return elapsed
+
+    latencies = await asyncio.gather(*[render() for _ in range(clients)])
+
+    # scripting round trips
+    async def scripting():
+        client = Client(app)
+        await client.connect()
+        await client.open("/scripting/")
+        await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[scripting() for _ in range(clients)])
+    scripting_s = time.perf_counter() - start
+
+    # memory per idle connection
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    idle = []
+    for _ in range(clients):
+        client = Client(app)
+        await client.connect()
+        await client.open("/table/")
+        idle.append(client)
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await asyncio.gather(*[client.close() for client in idle])
+
+    latencies.sort()
+    return {
+        "clients": clients,
+        "render_ms_median": statistics.median(latencies) * 1e3,
+        "render_ms_p95": latencies[int(len(latencies) * 0.95) - 1] * 1e3,
+        "scripting_per_s": clients * rounds / scripting_s,
+        "bytes_per_connection": (after - before) / clients,
+    }
+
+
+def run(clients: int = 100, rows: int = 100, rounds: int = 20) -> dict:
+    """Runs the load test in a temporary project; returns the results."""
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project(tmp, rows, rounds)
+        os.chdir(tmp)
+
+        try:
+            result = asyncio.run(measure(clients, rounds))
+        finally:
+            os.chdir(cwd)
+
+    return result | {"rows": rows, "rounds": rounds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-c", "--clients", type=int, default=100)
+    parser.add_argument("-r", "--rows", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    result = run(args.clients, args.rows, args.rounds)
+    print(
+        f"{result['clients']} clients: render "
+        f"{result['render_ms_median']:.1f}ms median, "
+        f"{result['render_ms_p95']:.1f}ms p95; "
+        f"{result['scripting_per_s']:.0f} scriptings/s; "
+        f"{result['bytes_per_connection'] / 1024:.1f}KiB per connection"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Startup benchmark: maps N synthetic pages sequentially and in parallel."""
+import argparse
+import os
+import tempfile
+import time
+
+from pagable.backend.cache import MarkdownCache
+from pagable.backend.load import MARKDOWN_EXTRAS, map_source
+
+PAGE = """---
+title: Page {i}
+theme: auto
+---
+
+# Page {i}
+
+Some *markdown* with a [link](https://example.com/{i}) and a list:
+
+{items}
+
+```python
+print({i})
+```
+"""
+
+
+def generate(source: str, pages: int):
+    """Generates ``pages`` synthetic markdown pages under ``source``."""
+    for i in range(pages):
+        directory = os.path.join(source, "pages", f"section{i % 50}")
+        os.makedirs(directory, exist_ok=True)
+
+        with open(
+            os.path.join(directory, f"page{i}.md"),
+            "w",
+            encoding="utf-8"
+        ) as f:
+            f.write(PAGE.format(
+                i=i,
+                items="\n".join(f"- item {j}" for j in range(20))
+            ))
+
+
+def timed(source: str, processes, cache: MarkdownCache) -> float:
+    start = time.perf_counter()
+    map_source(source, save=False, cache=cache, processes=processes)
+    return time.perf_counter() - start
+
+
+def run(pages: int, processes=None) -> dict:
+    """Maps ``pages`` synthetic pages; returns wall times in seconds."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "src")
+        generate(source, pages)
+        cache = os.path.join(tmp, "cache")
+
+        return {
+            "pages": pages,
+            "sequential": timed(
+                source, 1, MarkdownCache(cache, extras=MARKDOWN_EXTRAS)
+            ),
+            "parallel": timed(
+                source, processes, MarkdownCache(cache, extras=MARKDOWN_EXTRAS)
+            ),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--pages", type=int, default=1000)
+    parser.add_argument("-p", "--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    result = run(args.pages, args.processes)
+    print(
+        f"{result['pages']} pages: "
+        f"sequential {result['sequential']:.3f}s, "
+        f"parallel {result['parallel']:.3f}s "
+        f"({result['sequential'] / result['parallel']:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: building and serializing a large table of elements.
+
+"before" converts the tree to nested mappings while building it, then encodes
+them with ``json``; "after" keeps elements as-is and serializes them in a
+single pass (see ``pagable.backend.serialize``). Building and serializing
+(through ``Component._get_content``) are also timed on their own.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from pagable import Component, html
+from pagable.backend.serialize import dumps
+
+
+def table(rows: int):
+    return html.table(
+        html.tbody([
+            html.tr([
+                html.td(str(index)),
+                html.td(f"row {index}", cls="name"),
+                html.td(html.a("open", href=f"/rows/{index}/")),
+            ], key=str(index))
+            for index in range(rows)
+        ])
+    )
+
+
+def timed(func) -> tuple:
+    """Runs ``func``; returns (result, seconds, peak bytes allocated)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(rows: int = 10_000) -> dict:
+    """Returns build and serialize costs, before and after."""
+    before, before_s, before_peak = timed(
+        lambda: json.dumps({"ctnt": table(rows).mapping}).encode()
+    )
+    after, after_s, after_peak = timed(lambda: dumps({"ctnt": table(rows)}))
+    tree, build_s, _ = timed(lambda: table(rows))
+    component = Component(table)
+    _, serialize_s, _ = timed(
+        lambda: dumps({"ctnt": component._get_content(tree)})
+    )
+
+    return {
+        "rows": rows,
+        "build_ms": build_s * 1e3,
+        "serialize_ms": serialize_s * 1e3,
+        "before_ms": before_s * 1e3,
+        "after_ms": after_s * 1e3,
+        "before_peak_kb": before_peak / 1024,
+        "after_peak_kb": after_peak / 1024,
+        "before_bytes": len(before),
+        "after_bytes": len(after),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    result = run(args.rows)
+    print(
+        f"{result['rows']} rows: "
+        f"build {result['build_ms']:.1f}ms, "
+        f"serialize {result['serialize_ms']:.1f}ms; "
+        f"before {result['before_ms']:.1f}ms, "
+        f"{result['before_peak_kb']:.0f}KiB peak, "
+        f"{result['before_bytes']} bytes; "
+        f"after {result['after_ms']:.1f}ms, "
+        f"{result['after_peak_kb']:.0f}KiB peak, "
+        f"{result['after_bytes']} bytes"
+    )
+
+
+if __name__ == "__main__":
+    main()
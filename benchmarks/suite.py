@@ -0,0 +1,141 @@
+"""Runs every benchmark and saves the results as JSON.
+
+``idle`` isn't included, since it needs a project directory.
+
+Results are written to ``benchmarks/results/<commit>.json`` by default, so
+runs on different commits can be compared with ``--compare``. Benchmarks
+whose dependencies aren't installed are recorded as skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import connections, hooks, load, mapping, render, wire
+
+RESULTS = os.path.join(os.path.dirname(__file__), "results")
+
+
+def benchmarks(sizes: List[int]) -> List[Tuple[str, Callable[[], dict]]]:
+    return [
+        ("render", render.run),
+        ("wire", wire.run),
+        *[
+            (f"mapping[{size}]", lambda size=size: mapping.run(size))
+            for size in sizes
+        ],
+        ("hooks", hooks.run),
+        ("connections", connections.run),
+        ("load", load.run),
+    ]
+
+
+def commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(sizes: List[int], only: Optional[List[str]] = None) -> dict:
+    """Runs the benchmarks; returns their results, by name."""
+    results: Dict[str, dict] = {}
+
+    for name, func in benchmarks(sizes):
+        if only and name.split("[")[0] not in only:
+            continue
+
+        print(f"running {name}...", file=sys.stderr)
+        start = time.perf_counter()
+
+        try:
+            result = func()
+
+        except ImportError as err:
+            result = {"skipped": str(err)}
+
+        results[name] = result | {
+            "wall_s": time.perf_counter() - start
+        }
+
+    return {
+        "commit": commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def flatten(data, prefix: str = "") -> Dict[str, float]:
+    """Flattens nested results to ``{"a.b": number}``."""
+    if isinstance(data, dict):
+        flat = {}
+        for key, value in data.items():
+            flat |= flatten(value, f"{prefix}.{key}" if prefix else key)
+
+        return flat
+
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        return {prefix: data}
+
+    return {}
+
+
+def compare(old: dict, new: dict):
+    """Prints the change of every metric found in both runs."""
+    before = flatten(old["results"])
+    after = flatten(new["results"])
+    print(f"{old['commit']} -> {new['commit']}")
+
+    for key, value in after.items():
+        if key not in before:
+            continue
+
+        base = before[key]
+        change = (value - base) / base * 100 if base else 0.0
+        print(f"  {key:<48} {base:>14.3f} {value:>14.3f} {change:+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 1_000, 10_000],
+        help="page counts for the mapping benchmark"
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        help="benchmarks to run, e.g., render wire"
+    )
+    parser.add_argument("-o", "--output", help="where to save the results")
+    parser.add_argument("--compare", help="earlier results to compare with")
+    args = parser.parse_args()
+
+    result = run(args.sizes, args.only)
+    output = args.output or os.path.join(RESULTS, f"{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(f"saved to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), result)
+
+
+if __name__ == "__main__":
+    main()
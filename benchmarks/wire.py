@@ -0,0 +1,82 @@
+"""Benchmark: bytes on the wire and encode/decode time of a render message.
+
+Compares the websocket encodings (``json`` and ``msgpack``), each with and
+without permessage-deflate (approximated with a raw deflate stream, as the
+extension uses). ``msgpack`` is skipped if it isn't installed.
+"""
+import argparse
+import time
+import zlib
+
+from pagable.backend.serialize import dumps, loads, msgpack
+
+from .render import table
+
+
+def deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def per_call(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+
+    return (time.perf_counter() - start) / repeat
+
+
+def run(rows: int = 1_000, repeat: int = 20) -> dict:
+    """Returns sizes (bytes) and times (milliseconds) for each encoding."""
+    message = {
+        "type": 1,
+        "ctyp": "py",
+        "ctnt": table(rows),
+        "requires": [],
+        "meta": {},
+        "initial": True
+    }
+    result = {"rows": rows}
+
+    for encoding in ("json", "msgpack"):
+        if encoding == "msgpack" and msgpack is None:
+            continue
+
+        data = dumps(message, encoding)
+        result[encoding] = {
+            "bytes": len(data),
+            "deflate_bytes": len(deflate(data)),
+            "encode_ms": per_call(
+                lambda: dumps(message, encoding), repeat
+            ) * 1e3,
+            "decode_ms": per_call(
+                lambda: loads(data, encoding), repeat
+            ) * 1e3,
+            "deflate_ms": per_call(lambda: deflate(data), repeat) * 1e3,
+        }
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--rows", type=int, default=1_000)
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.repeat)
+    for encoding in ("json", "msgpack"):
+        if encoding not in result:
+            print(f"{encoding}: skipped (not installed)")
+            continue
+
+        r = result[encoding]
+        print(
+            f"{encoding}: {r['bytes']} bytes, {r['deflate_bytes']} deflated; "
+            f"encode {r['encode_ms']:.2f}ms, decode {r['decode_ms']:.2f}ms, "
+            f"deflate {r['deflate_ms']:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
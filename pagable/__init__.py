@@ -1,6 +1,6 @@
-from .api import Component, get_component
+from .api import Component, get_component, pure
 from .elements import Element, html
-from .frontend_api import LocalStorage, alert, throw
+from .frontend_api import LocalStorage, alert, batch, throw
 from .hooks import use_state
 from .types import Requires
 
@@ -8,9 +8,11 @@ __all__ = (
     "Component",
     "Element",
     "get_component",
+    "pure",
     "use_state",
     "LocalStorage",
     "alert",
+    "batch",
     "html",
     "throw",
     "Requires"
@@ -1,32 +1,76 @@
 import asyncio
 import inspect
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union, overload
+import itertools
+import time
+from contextvars import ContextVar, Token
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    overload
+)
 
 from .elements import Element
-from .exceptions import PageError
+from .exceptions import ConnectionRequired, PageError
 
 FunctionComponent = Callable[..., Any]
 
+# the component being rendered in this context
+_current: ContextVar[Optional["Component"]] = ContextVar(
+    "pagable_component",
+    default=None
+)
+
+# the batch open in this context; other tasks of the render don't see it
+_batch: ContextVar[Optional["Batch"]] = ContextVar(
+    "pagable_batch",
+    default=None
+)
+
 class Component(object):
-    """Represents a component."""
+    """Represents a component.
+
+    Args:
+        func: The rendering function.
+        params (Dict[str, str], optional): Route parameters (e.g., ``id`` for
+            ``users/[id].py``), passed to the rendering function by name.
+    """
     __slots__ = (
         "render",
+        "params",
         "states",
         "_next_states",
         "__ws__",
-        "first_rendered",
-        "pending_data",
+        "pending",
+        "_requests",
+        "streamed",
     )
     render: FunctionComponent
+    params: Dict[str, str]
     states: Dict[str, Any]
     _next_states: Dict[str, Any]
     __ws__: Any
-    first_rendered: bool
-    pending_data: Optional[dict]
+    pending: Dict[int, "asyncio.Future[Any]"]
+    _requests: Iterator[int]
+    streamed: bool
+
+    #: Seconds to wait for the client to answer a scripting request.
+    scripting_timeout: ClassVar[float] = 30.0
     
-    def __init__(self, func):
-        self.first_rendered = False
+    def __init__(self, func, params: Optional[Dict[str, str]] = None):
         self.render = func
+        self.params = params or {}
+        self.__ws__ = None
+        self.pending = {}
+        self._requests = itertools.count()
+        self.streamed = False
         self.states = self._next_states = {}
         self.process_args()
 
@@ -45,8 +89,9 @@ class Component(object):
                 self.states[name] = params[name].default
 
     def _get_content(self, data):
+        # elements are kept as-is; they're serialized in a single pass
         if isinstance(data, Element):
-            return data.mapping
+            return data
 
         elif isinstance(data, List):
             return [self._get_content(item) for item in data]
@@ -55,10 +100,80 @@ class Component(object):
             return str(data)
 
     async def __call__(self):
-        """Calls the rendering function."""
+        """Calls the rendering function.
+
+        The component is the current one (see :func:`get_component`) while
+        rendering, including in tasks spawned during the render.
+
+        Streamed renders are collected into a list of their chunks.
+        """
+        chunks = [chunk async for chunk in self.stream()]
+        return chunks if self.streamed else chunks[0]
+
+    async def stream(self) -> AsyncGenerator[Any, None]:
+        """Calls the rendering function, yielding content as it's rendered.
+
+        Async generator handlers (and handlers returning an async iterable)
+        yield one chunk per item, and :attr:`streamed` is set; other handlers
+        yield their whole content once. The next chunk isn't rendered until
+        the caller asks for it, so a slow client slows the render down
+        instead of piling chunks up.
+        """
         self.forward_state_updates()
-        data = await self.render()
-        return self._get_content(data)
+        kwargs = self._route_kwargs()
+
+        if inspect.isasyncgenfunction(self.render):
+            chunks = self.render(**kwargs)
+        else:
+            token = _current.set(self)
+            try:
+                data = await self.render(**kwargs)
+            finally:
+                _current.reset(token)
+
+            if not hasattr(data, "__aiter__"):
+                self.streamed = False
+                yield self._get_content(data)
+                return
+
+            chunks = data
+
+        self.streamed = True
+        iterator = chunks.__aiter__()
+
+        try:
+            while True:
+                token = _current.set(self)
+                try:
+                    data = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    _current.reset(token)
+
+                yield self._get_content(data)
+
+        finally:
+            if hasattr(iterator, "aclose"):
+                await iterator.aclose()
+
+    def _route_kwargs(self) -> Dict[str, str]:
+        if not self.params:
+            return {}
+
+        params = inspect.signature(self.render).parameters
+
+        if any(
+            param.kind == inspect.Parameter.VAR_KEYWORD
+            for param in params.values()
+        ):
+            return self.params
+
+        return {
+            name: value
+            for name, value in self.params.items()
+            if name in params
+        }
 
     def update_state(self, key: str, value: Any):
         """Updates a state for next the next render.
@@ -78,43 +193,216 @@ class Component(object):
         """Forwards previously cached state updates."""
         self.states.update(self._next_states)
 
-    async def add_scripting(self, script: str) -> Any:
-        """Adds a scripting. (coroutine)"""
-        await self.__ws__.send_json({
-            "type": 2,
-            "ctnt": script
-        })
-        if not self.first_rendered:
-            data = None
-
-            while not data:
-                d = await self.__ws__.receive_json()
-            
-                if d['type'] == 2:
-                    data = d
-                elif d['type'] == 2.1:
-                    raise PageError(d)
-
-            return data['ctnt']
+    async def add_scripting(
+        self,
+        script: str,
+        *,
+        wait: bool = True,
+        decode: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """Adds a scripting. (coroutine)
+
+        The response is correlated by request id, so multiple scriptings can
+        be in flight at once.
+
+        While a :obj:`Batch` is active in the calling task, the script is
+        queued instead and ``None`` is returned; see :meth:`batch`.
+
+        Args:
+            script (str): The script.
+            wait (bool, optional): Whether to wait for the result. If false,
+                the script is fired and forgotten, and ``None`` is returned.
+            decode (Callable[[Any], Any], optional): Applied to the result,
+                including the result collected by a :obj:`Batch`.
+
+        Raises:
+            PageError: The script raised an error on the frontend.
+            asyncio.TimeoutError: The client didn't answer in time.
+            ConnectionRequired: There's no client connection.
+        """
+        batch = _batch.get()
+        if batch is not None and batch.component is self:
+            batch.scripts.append(script)
+            batch.decoders.append(decode)
+            return None
+
+        result = await self._send_scripting(script, wait=wait)
+        return result if decode is None or not wait else decode(result)
+
+    async def gather(self, *scripts: str, wait: bool = True) -> List[Any]:
+        """Runs scripts in order, in a single round trip. (coroutine)
+
+        Args:
+            *scripts (str): The scripts.
+            wait (bool, optional): Whether to wait for the results.
+
+        Returns:
+            List[Any]: The results, in order. Empty if not waiting.
+        """
+        if not scripts:
+            return []
+
+        return await self._send_scripting(list(scripts), wait=wait) or []
+
+    def batch(self, *, wait: bool = True) -> "Batch":
+        """Coalesces scriptings made inside the block into one round trip.
+
+        Example:
+            .. code-block :: python
+
+                async with component.batch() as batch:
+                    await storage.set_item("a", "1")
+                    await storage.get_item("b") # returns None here
+
+                print(batch.results)
+
+        Args:
+            wait (bool, optional): Whether to wait for the results.
+        """
+        return Batch(self, wait=wait)
+
+    async def _send_scripting(
+        self,
+        ctnt: Union[str, List[str]],
+        *,
+        wait: bool
+    ) -> Any:
+        if self.__ws__ is None:
+            raise ConnectionRequired(
+                "frontend APIs need a client connection"
+            )
+
+        if not wait:
+            await self.__ws__.send({
+                "type": 2,
+                "id": None,
+                "ctnt": ctnt
+            })
+            return None
+
+        request_id = next(self._requests)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        started = time.perf_counter()
+
+        try:
+            await self.__ws__.send({
+                "type": 2,
+                "id": request_id,
+                "ctnt": ctnt
+            })
+            result = await asyncio.wait_for(future, self.scripting_timeout)
+            self.__ws__.observe_scripting(time.perf_counter() - started)
+            return result
+
+        finally:
+            self.pending.pop(request_id, None)
+
+    def resolve_scripting(self, data: dict):
+        """Resolves a pending scripting with the data received from the client.
+
+        Args:
+            data (dict): The received data (``type`` 2 or 2.1).
+        """
+        future = self.pending.pop(data.get('id'), None) # type: ignore
+
+        if not future or future.done():
+            return
 
+        if data['type'] == 2:
+            future.set_result(data['ctnt'])
         else:
-            self.pending_data = None
-            while not self.pending_data:
-                await asyncio.sleep(0.01)
+            future.set_exception(PageError(data))
+
+    def cancel_scripting(self):
+        """Cancels every pending scripting, e.g., on disconnect."""
+        for future in self.pending.values():
+            future.cancel()
+
+        self.pending.clear()
+
+class Batch:
+    """Represents a batch of scriptings, sent as one message on exit.
+
+    Attributes:
+        component (:obj:`Component`): The component.
+        scripts (List[str]): The queued scripts.
+        decoders (List[Optional[Callable]]): What's applied to the result
+            of each script, if anything.
+        results (List[Any]): The results, available after the block.
+        wait (bool): Whether to wait for the results.
+    """
+    __slots__ = (
+        "component",
+        "scripts",
+        "decoders",
+        "results",
+        "wait",
+        "_token",
+    )
+    component: Component
+    scripts: List[str]
+    decoders: List[Optional[Callable[[Any], Any]]]
+    results: List[Any]
+    wait: bool
+    _token: Optional[Token]
+
+    def __init__(self, component: Component, *, wait: bool = True):
+        self.component = component
+        self.scripts = []
+        self.decoders = []
+        self.results = []
+        self.wait = wait
+        self._token = None
+
+    async def __aenter__(self) -> "Batch":
+        self._token = _batch.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, *_):
+        if self._token is not None:
+            _batch.reset(self._token)
+            self._token = None
+
+        if exc_type is None:
+            results = await self.component.gather(
+                *self.scripts,
+                wait=self.wait
+            )
+            self.results = [
+                result if decode is None else decode(result)
+                for result, decode in zip(results, self.decoders)
+            ]
+
+def pure(func: FunctionComponent) -> FunctionComponent:
+    """Marks a page's ``handle()`` as pure.
+
+    Its renders then only depend on the route and the states, and are
+    cached and shared by every connection. Pure pages must not use frontend
+    APIs. Setting ``__pure__ = True`` in the page module does the same.
+
+    Example:
+        .. code-block :: python
+
+            @pure
+            async def handle():
+                return html.h1("Welcome!")
+    """
+    func.__pure__ = True # type: ignore
+    return func
 
-            return self.pending_data['ctnt']
 
 def get_component() -> Component:
-    """Gets the (nearest) function component.
+    """Gets the function component currently rendering.
 
     Raises:
         TypeError: This wasn't called from a component (origin).
     """
-    for stack in inspect.stack()[1:]:
-        _locals = stack[0].f_locals
-        if 'self' in _locals and isinstance(_locals['self'], Component):
-            return _locals['self']
+    component = _current.get()
 
-    raise TypeError(
-        "`get_component()` wasn't made from a component."
-    )
+    if component is None:
+        raise TypeError(
+            "`get_component()` wasn't made from a component."
+        )
+
+    return component
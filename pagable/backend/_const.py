@@ -12,4 +12,10 @@ EXTENSION_EMOJIS = {
     "md": "🔥"
 }
 
+THEMES = {
+    "auto": "https://cdn.jsdelivr.net/npm/water.css@2/out/water.min.css",
+    "light": "https://cdn.jsdelivr.net/npm/water.css@2/out/light.min.css",
+    "dark": "https://cdn.jsdelivr.net/npm/water.css@2/out/dark.min.css"
+}
+
 here = os.path.abspath(os.path.dirname(__file__))
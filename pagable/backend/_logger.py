@@ -1,25 +1,267 @@
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
-from typing import Literal
+from typing import Dict, List, Literal, Optional, Tuple
+
+from rich.errors import MarkupError
+from rich.markup import escape
+from rich.text import Text
 
 from ._const import console
 
+Level = Literal["debug", "info", "warning", "error"]
+LogFormat = Literal["rich", "json"]
+
+LEVELS: Dict[str, int] = {
+    "debug": 10,
+    "info": 20,
+    "warning": 30,
+    "error": 40,
+}
+
 
 class _Time:
+    def __init__(self, at: Optional[float] = None):
+        self.at = at
+
     def __format__(
-        self, 
+        self,
         __type: Literal['colored', 'plain']
     ) -> str:
         return (
             "{s}{now:%b %d / %H:%M:%S}{e}"
         ).format(
-            now=datetime.now(),
+            now=datetime.now() if self.at is None
+                else datetime.fromtimestamp(self.at),
             s={"colored": "[d white]", "plain": ""}[__type],
             e={"colored": "[/]", "plain": ""}[__type]
         )
 
 now = _Time()
 
-class logger:
-    @staticmethod
-    def log(*data):
-        console.print(f"{now:colored}", *data)
+
+class Record:
+    """Represents a log record.
+
+    Attributes:
+        time (float): When it was logged (``time.time()``).
+        level (Level): The level.
+        message (str): The message, with rich markup. Interpolated data
+            must be escaped (``rich.markup.escape``).
+    """
+    __slots__ = (
+        "time",
+        "level",
+        "message",
+    )
+    time: float
+    level: Level
+    message: str
+
+    def __init__(self, level: Level, message: str):
+        self.time = time.time()
+        self.level = level
+        self.message = message
+
+
+class _Logger:
+    """Represents a non-blocking logger.
+
+    Logging only enqueues a record; a background thread writes it out, so
+    console rendering never blocks the event loop. Records are written as
+    ``rich`` pretty lines, or as JSON lines (to stdout) for production.
+
+    Repeated warnings and errors with the same key are rate limited: at most
+    ``burst`` per ``window`` seconds, then the number suppressed is reported
+    once the window is over.
+    """
+    __slots__ = (
+        "level",
+        "format",
+        "burst",
+        "window",
+        "_queue",
+        "_thread",
+        "_limits",
+        "_lock",
+    )
+    level: int
+    format: LogFormat
+    burst: int
+    window: float
+    _queue: "queue.Queue[Optional[Record]]"
+    _thread: Optional[threading.Thread]
+    # key -> [window start, count, suppressed]
+    _limits: Dict[str, List[float]]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self.level = LEVELS["info"]
+        self.format = "rich"
+        self.burst = 5
+        self.window = 10.0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._limits = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        *,
+        level: Optional[Level] = None,
+        format: Optional[LogFormat] = None,
+        rate_limit: Optional[Tuple[int, float]] = None
+    ):
+        """Configures the logger.
+
+        Args:
+            level (Level, optional): The minimum level to write.
+            format (LogFormat, optional): ``rich`` or ``json``.
+            rate_limit (Tuple[int, float], optional): Records with the same
+                key allowed per window (seconds).
+        """
+        if level is not None:
+            self.level = LEVELS[level]
+
+        if format is not None:
+            self.format = format
+
+        if rate_limit is not None:
+            self.burst, self.window = rate_limit
+
+    def log(self, *data, level: Level = "info", key: Optional[str] = None):
+        """Logs a message.
+
+        Args:
+            *data: The message parts (with rich markup), joined by spaces.
+            level (Level, optional): The level.
+            key (str, optional): The rate limiting key. Defaults to the
+                message itself.
+        """
+        if LEVELS[level] < self.level:
+            return
+
+        message = " ".join(str(item) for item in data)
+
+        # only warnings and errors tend to repeat in bursts
+        suppressed = (
+            self._limit(key or message)
+            if LEVELS[level] >= LEVELS["warning"] else 0
+        )
+
+        if suppressed is None:
+            return
+
+        if suppressed:
+            self._put(Record(
+                "warning",
+                f"[yellow]({int(suppressed)} similar messages suppressed)[/]"
+            ))
+
+        self._put(Record(level, message))
+
+    def debug(self, *data, key: Optional[str] = None):
+        self.log(*data, level="debug", key=key)
+
+    def warning(self, *data, key: Optional[str] = None):
+        self.log(*data, level="warning", key=key)
+
+    def error(self, *data, key: Optional[str] = None):
+        self.log(*data, level="error", key=key)
+
+    def _limit(self, key: str) -> Optional[float]:
+        """Returns suppressed records to report, or ``None`` to drop."""
+        current = time.monotonic()
+
+        with self._lock:
+            limit = self._limits.get(key)
+
+            if limit is None or current - limit[0] >= self.window:
+                suppressed = limit[2] if limit else 0
+                self._limits[key] = [current, 1, 0]
+
+                if len(self._limits) > 1024:
+                    # forget keys that are quiet
+                    for stale in [
+                        k for k, v in self._limits.items()
+                        if current - v[0] >= self.window
+                    ]:
+                        del self._limits[stale]
+
+                return suppressed
+
+            if limit[1] >= self.burst:
+                limit[2] += 1
+                return None
+
+            limit[1] += 1
+            return 0
+
+    def _put(self, record: Record):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._write,
+                name="pagable-logger",
+                daemon=True
+            )
+            self._thread.start()
+
+        self._queue.put(record)
+
+    def _write(self):
+        while True:
+            record = self._queue.get()
+
+            try:
+                if record is None:
+                    return
+
+                try:
+                    text = Text.from_markup(record.message)
+                except MarkupError:
+                    # unescaped data; keep the record, unstyled
+                    text = Text(record.message)
+
+                if self.format == "json":
+                    at = datetime.fromtimestamp(record.time)
+                    sys.stdout.write(json.dumps({
+                        "time": at.isoformat(timespec="milliseconds"),
+                        "level": record.level,
+                        "message": text.plain,
+                    }) + "\n")
+                    sys.stdout.flush()
+                else:
+                    console.print(
+                        Text.from_markup(f"{_Time(record.time):colored}"),
+                        text
+                    )
+
+            except Exception as err:
+                # e.g., broken markup
+                console.print(escape(f"cannot log: {err}"))
+
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Waits until every queued record is written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _after_fork(self):
+        # the writer thread doesn't survive a fork
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+
+logger = _Logger()
+atexit.register(logger.flush)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=logger._after_fork)
@@ -0,0 +1,229 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Literal, Set
+
+from rich.markup import escape
+
+from ._logger import logger
+
+SlowPolicy = Literal["drop", "disconnect"]
+
+
+class Subscriber:
+    """Represents a connection subscribed to updates of a route.
+
+    Attributes:
+        route (str): The route.
+        callback: Re-renders the route for this connection.
+        close: Closes the connection.
+        busy (bool): Whether an update is being delivered.
+        queued (int): Updates waiting behind the one being delivered.
+    """
+    __slots__ = (
+        "route",
+        "callback",
+        "close",
+        "busy",
+        "queued",
+    )
+    route: str
+    callback: Callable[[], Awaitable[None]]
+    close: Callable[[], Awaitable[None]]
+    busy: bool
+    queued: int
+
+    def __init__(
+        self,
+        route: str,
+        callback: Callable[[], Awaitable[None]],
+        close: Callable[[], Awaitable[None]]
+    ):
+        self.route = route
+        self.callback = callback
+        self.close = close
+        self.busy = False
+        self.queued = 0
+
+
+class BroadcastStats:
+    """Represents fan-out statistics.
+
+    Attributes:
+        emits (int): Emitted route updates.
+        deliveries (int): Updates delivered to connections.
+        dropped (int): Updates dropped because a queue was full.
+        timeouts (int): Deliveries that timed out.
+        disconnects (int): Slow connections that were closed.
+        latency_total (float): Sum of emit-to-delivery latencies (seconds).
+        latency_max (float): Maximum emit-to-delivery latency (seconds).
+    """
+    __slots__ = (
+        "emits",
+        "deliveries",
+        "dropped",
+        "timeouts",
+        "disconnects",
+        "latency_total",
+        "latency_max",
+    )
+
+    def __init__(self):
+        self.emits = self.deliveries = self.dropped = 0
+        self.timeouts = self.disconnects = 0
+        self.latency_total = self.latency_max = 0.0
+
+    def record(self, latency: float):
+        self.deliveries += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+
+class Broadcaster:
+    """Represents a route-indexed subscription registry.
+
+    Emitting a route only touches the connections subscribed to it. Each
+    connection gets its updates one at a time, with a bounded queue behind
+    the update in flight; a slow connection never delays the others.
+
+    Args:
+        timeout (float, optional): Seconds a single delivery may take.
+        max_queued (int, optional): Updates that may wait per connection;
+            more are dropped. Since an update always renders the latest
+            version, one is enough to never miss a change.
+        slow_policy (SlowPolicy, optional): What to do when a delivery times
+            out: ``drop`` the update, or ``disconnect`` the connection.
+    """
+    __slots__ = (
+        "subscribers",
+        "timeout",
+        "max_queued",
+        "slow_policy",
+        "stats",
+        "_tasks",
+    )
+    subscribers: Dict[str, Set[Subscriber]]
+    timeout: float
+    max_queued: int
+    slow_policy: SlowPolicy
+    stats: BroadcastStats
+    _tasks: Set["asyncio.Task[None]"]
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 5.0,
+        max_queued: int = 1,
+        slow_policy: SlowPolicy = "drop"
+    ):
+        self.subscribers = {}
+        self.timeout = timeout
+        self.max_queued = max_queued
+        self.slow_policy = slow_policy
+        self.stats = BroadcastStats()
+        self._tasks = set()
+
+    def subscribe(
+        self,
+        route: str,
+        callback: Callable[[], Awaitable[None]],
+        close: Callable[[], Awaitable[None]]
+    ) -> Subscriber:
+        """Subscribes a connection to a route.
+
+        Args:
+            route (str): The route.
+            callback: Re-renders the route for the connection.
+            close: Closes the connection.
+        """
+        subscriber = Subscriber(route, callback, close)
+        self.subscribers.setdefault(route, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Unsubscribes a connection.
+
+        Args:
+            subscriber (Subscriber): The subscriber.
+        """
+        subscribers = self.subscribers.get(subscriber.route)
+        if subscribers is None:
+            return
+
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.subscribers[subscriber.route]
+
+    def count(self) -> int:
+        """Counts subscribed connections."""
+        return sum(len(subs) for subs in self.subscribers.values())
+
+    async def emit(self, route: str):
+        """Notifies the connections of a route about an update.
+
+        Deliveries run in the background; this doesn't wait for them.
+
+        Args:
+            route (str): The route.
+        """
+        self.stats.emits += 1
+        emitted = time.perf_counter()
+
+        for subscriber in tuple(self.subscribers.get(route, ())):
+            if not subscriber.busy:
+                subscriber.busy = True
+                task = asyncio.create_task(self._drain(subscriber, emitted))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            elif subscriber.queued < self.max_queued:
+                subscriber.queued += 1
+
+            else:
+                # already covered by a queued update
+                self.stats.dropped += 1
+
+    async def _drain(self, subscriber: Subscriber, emitted: float):
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        subscriber.callback(),
+                        self.timeout
+                    )
+                    self.stats.record(time.perf_counter() - emitted)
+
+                except asyncio.TimeoutError:
+                    self.stats.timeouts += 1
+                    if await self._slow(subscriber):
+                        return
+
+                except Exception as err:
+                    logger.error(
+                        "[red]ERROR (cannot emit)[/] " + escape(str(err)),
+                        key="emit"
+                    )
+
+                if not subscriber.queued:
+                    return
+
+                subscriber.queued -= 1
+                emitted = time.perf_counter()
+
+        finally:
+            subscriber.busy = False
+
+    async def _slow(self, subscriber: Subscriber) -> bool:
+        """Applies the slow consumer policy. Returns whether it's closed."""
+        if self.slow_policy != "disconnect":
+            return False
+
+        self.stats.disconnects += 1
+        self.unsubscribe(subscriber)
+        subscriber.queued = 0
+
+        try:
+            await subscriber.close()
+        except Exception:
+            pass
+
+        return True
@@ -0,0 +1,298 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
+
+from rich.markup import escape
+
+from ..api import Component
+from ..exceptions import ConnectionRequired
+from ._const import console
+from .cache import MarkdownCache
+from .load import MARKDOWN_EXTRAS, load, map_source, normalize
+from .routes import is_dynamic
+from .ssr import inject, render_html
+
+BUILD_STATE = ".pagable-build.json"
+ASSET_DIRS = ("scripts", "styles")
+
+APP_SCRIPT = re.compile(r'\s*<script[^>]*src="/app\.js"[^>]*>\s*</script>')
+# e.g., href="/styles/index.css"
+ASSET_URL = re.compile(
+    r"""(\b(?:src|href)\s*=\s*["'])(/(?:scripts|styles)/[^"'?#]+)"""
+)
+
+# (html, requires), or None if the page needs a client connection
+Rendered = Optional[Tuple[str, List[str]]]
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def copy_assets(source: str, out: str) -> Dict[str, str]:
+    """Copies ``src/scripts`` and ``src/styles`` with content-hashed names.
+
+    The files are also copied as-is, for references that can't be rewritten
+    (e.g., imports inside scripts).
+
+    Args:
+        source (str): The source path. Usually ``./src/``.
+        out (str): The output directory.
+
+    Returns:
+        Dict[str, str]: The manifest, from original URL to hashed URL.
+    """
+    manifest: Dict[str, str] = {}
+
+    for directory in ASSET_DIRS:
+        base = os.path.join(source, directory)
+
+        for root, _, filenames in os.walk(base):
+            for filename in sorted(filenames):
+                fp = os.path.join(root, filename)
+                rel = normalize(os.path.relpath(fp, source))
+
+                with open(fp, "rb") as f:
+                    data = f.read()
+
+                name, dot, ext = rel.rpartition(".")
+                hashed = (
+                    f"{name}.{digest(data)[:10]}.{ext}" if dot
+                    else f"{rel}.{digest(data)[:10]}"
+                )
+                target = os.path.join(out, hashed)
+
+                if not os.path.exists(target):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with open(target, "wb") as f:
+                        f.write(data)
+
+                write_asset(os.path.join(out, rel), data)
+                manifest["/" + rel] = "/" + hashed
+
+    return manifest
+
+
+def write_asset(fp: str, data: bytes):
+    try:
+        with open(fp, "rb") as f:
+            if f.read() == data:
+                return
+    except OSError:
+        pass
+
+    os.makedirs(os.path.dirname(fp), exist_ok=True)
+    with open(fp, "wb") as f:
+        f.write(data)
+
+
+def rewrite_assets(page: str, manifest: Dict[str, str]) -> str:
+    """Points asset references (``src``, ``href``) at their hashed copies.
+
+    Args:
+        page (str): The HTML.
+        manifest (Dict[str, str]): The manifest; see :func:`copy_assets`.
+    """
+    return ASSET_URL.sub(
+        lambda m: m.group(1) + manifest.get(m.group(2), m.group(2)),
+        page
+    )
+
+
+def render_module(mod: ModuleType) -> Rendered:
+    """Renders a python page without a client connection.
+
+    Args:
+        mod (ModuleType): The page module.
+    """
+    comp = Component(mod.handle)
+
+    try:
+        content = asyncio.run(comp())
+    except ConnectionRequired:
+        return None
+
+    # stateful pages need the server
+    if comp.states:
+        return None
+
+    return render_html(content), list(getattr(mod, "requires", []))
+
+
+def render_python(fp: str, source: str) -> Rendered:
+    """Renders a python page in a worker process, which loads the module by
+    itself.
+
+    Args:
+        fp (str): The file path.
+        source (str): The source path. Usually ``./src/``.
+    """
+    return render_module(load(fp, source))
+
+
+def with_requires(page: str, requires: List[str]) -> str:
+    tags = "".join(
+        f'<link rel="stylesheet" type="text/css" href="{url}">\n'
+        if url.endswith(".css")
+        else f'<script type="module" src="{url}"></script>\n'
+        for url in requires
+    )
+    return page.replace("</head>", tags + "</head>", 1)
+
+
+def output_path(out: str, route: str) -> str:
+    return os.path.join(out, *route.strip("/").split("/"), "index.html")
+
+
+def write_page(out: str, route: str, page: Optional[str]):
+    if page is None:
+        console.print(
+            "[red b]index.html has no empty #root to render into[/]"
+        )
+        raise ValueError("cannot render into index.html")
+
+    fp = output_path(out, route)
+    os.makedirs(os.path.dirname(fp), exist_ok=True)
+
+    with open(fp, "w", encoding="utf-8") as f:
+        f.write(page)
+
+
+def build(
+    out: str = "./dist/",
+    *,
+    source: str = "./src/",
+    workers: Optional[int] = None
+) -> Dict[str, str]:
+    """Builds static pages to disk, so they can be served without Python.
+
+    Markdown routes and python routes that don't use frontend APIs or state
+    are rendered; other routes (and routes with parameters) are skipped.
+    Only pages whose source (or the template, or assets) changed since the
+    last build are rendered again.
+
+    Args:
+        out (str, optional): The output directory.
+        source (str, optional): The source path. Usually ``./src/``.
+        workers (int, optional): Worker processes for mapping Markdown and
+            rendering python pages. ``1`` does everything in this process.
+
+    Returns:
+        Dict[str, str]: Status for each route: ``built``, ``cached`` or
+            ``skipped``.
+    """
+    os.makedirs(out, exist_ok=True)
+
+    # the route mapping is left alone for the dev server, but rendered
+    # Markdown is worth keeping for the next build
+    cache = MarkdownCache(extras=MARKDOWN_EXTRAS).load()
+    mapping, modules = map_source(
+        source,
+        save=False,
+        cache=cache,
+        processes=workers
+    )
+    cache.save()
+
+    with open("index.html", "r", encoding="utf-8") as f:
+        template = APP_SCRIPT.sub("", f.read())
+
+    manifest = copy_assets(source, out)
+    with open(os.path.join(out, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    if os.path.isdir("./public"):
+        shutil.copytree("./public", out, dirs_exist_ok=True)
+
+    # route -> [source hash, whether it's static]
+    state_path = os.path.join(out, BUILD_STATE)
+    previous: Dict[str, list] = {}
+    if os.path.exists(state_path):
+        with open(state_path, "r") as f:
+            previous = json.load(f)
+
+    salt = digest((template + json.dumps(manifest)).encode())
+    hashes: Dict[str, list] = {}
+    status: Dict[str, str] = {}
+    python: List[str] = []
+
+    for route, entry in mapping.items():
+        if route.startswith("$"):
+            continue
+
+        # parameters can't be known ahead of time
+        if is_dynamic(route):
+            status[route] = "skipped"
+            continue
+
+        with open(entry['file'], "rb") as f:
+            hashes[route] = [digest(f.read() + salt.encode()), True]
+
+        last = previous.get(route)
+        if last and last[0] == hashes[route][0]:
+            if not last[1]:
+                hashes[route] = last
+                status[route] = "skipped"
+                continue
+
+            if os.path.exists(output_path(out, route)):
+                status[route] = "cached"
+                continue
+
+        if entry['type'] == "md":
+            ctnt = entry['ctnt']
+            page = inject(template, ctnt, ctnt.metadata) # type: ignore
+            page = page and rewrite_assets(page, manifest)
+            write_page(out, route, page)
+            status[route] = "built"
+        else:
+            python.append(route)
+
+    # the modules are already loaded here; workers load their own
+    if workers == 1 or len(python) < 2:
+        results = [render_module(modules[route]) for route in python]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                render_python,
+                [mapping[route]['file'] for route in python],
+                repeat(source)
+            ))
+
+    for route, rendered in zip(python, results):
+        if rendered is None:
+            status[route] = "skipped"
+            hashes[route][1] = False
+            continue
+
+        body, requires = rendered
+        page = inject(template, body)
+        page = page and rewrite_assets(
+            with_requires(page, requires),
+            manifest
+        )
+        write_page(out, route, page)
+        status[route] = "built"
+
+    # routes that are gone (or no longer static)
+    for route in previous:
+        if route not in hashes or not hashes[route][1]:
+            stale = output_path(out, route)
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    with open(state_path, "w") as f:
+        json.dump(hashes, f, indent=2)
+
+    for route, result in status.items():
+        color = {"built": "green", "cached": "d white"}.get(result, "yellow")
+        console.print(f"[{color}]{result:>7}[/] {escape(route)}")
+
+    return status
@@ -0,0 +1,231 @@
+import hashlib
+import os
+import pickle
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+import markdown2
+
+CACHE_VERSION = 1
+
+
+def digest_file(fp: str, salt: bytes) -> str:
+    """Gets the cache key of a Markdown file. Used by worker processes."""
+    with open(fp, "r", encoding="utf-8") as f:
+        return hashlib.sha256(salt + f.read().encode()).hexdigest()
+
+
+def render_file(fp: str, extras: List[str]) -> str:
+    """Renders a Markdown file. Used by worker processes."""
+    with open(fp, "r", encoding="utf-8") as f:
+        return markdown2.markdown(f.read(), extras=extras)
+
+
+class MarkdownCache:
+    """Represents a persistent, content-addressed cache of rendered Markdown.
+
+    Entries are keyed by the source content, the ``markdown2`` version and the
+    extras in use, so they survive restarts and are never stale by content.
+    Entries unused for ``max_age`` seconds are evicted on save, and the least
+    recently used ones are dropped beyond ``max_entries``.
+
+    Args:
+        path (str, optional): The cache file.
+        extras (List[str], optional): ``markdown2`` extras.
+        max_entries (int, optional): Maximum number of entries.
+        max_age (float, optional): Maximum seconds since last use.
+    """
+    __slots__ = (
+        "path",
+        "extras",
+        "max_entries",
+        "max_age",
+        "entries",
+        "hits",
+        "misses",
+        "salt",
+    )
+    path: str
+    extras: List[str]
+    max_entries: int
+    max_age: float
+    # key -> (html, last used); least recently used first
+    entries: "OrderedDict[str, Tuple[str, float]]"
+    hits: int
+    misses: int
+    salt: bytes
+
+    def __init__(
+        self,
+        path: str = "_pagable.mdcache",
+        *,
+        extras: Optional[List[str]] = None,
+        max_entries: int = 50_000,
+        max_age: float = 30 * 24 * 60 * 60
+    ):
+        self.path = path
+        self.extras = extras or []
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+        self.salt = (
+            f"{markdown2.__version__}\0{','.join(self.extras)}\0"
+        ).encode()
+
+    def key(self, text: str) -> str:
+        """Gets the cache key for Markdown source.
+
+        Args:
+            text (str): The source.
+        """
+        return hashlib.sha256(self.salt + text.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Gets a rendered entry, if cached.
+
+        Args:
+            key (str): The key, from :meth:`key`.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        self.entries[key] = (entry[0], time.time())
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, html: str):
+        """Puts a rendered entry.
+
+        Args:
+            key (str): The key, from :meth:`key`.
+            html (str): The rendered HTML (with ``metadata``).
+        """
+        self.entries[key] = (html, time.time())
+        self.entries.move_to_end(key)
+
+    def render(self, text: str) -> str:
+        """Renders Markdown, using the cache when possible.
+
+        Args:
+            text (str): The source.
+
+        Returns:
+            str: The rendered HTML, with ``metadata`` attached.
+        """
+        key = self.key(text)
+        html = self.get(key)
+
+        if html is not None:
+            self.hits += 1
+            return html
+
+        self.misses += 1
+        html = markdown2.markdown(text, extras=self.extras)
+        self.put(key, html)
+        return html
+
+    def render_files(
+        self,
+        files: List[str],
+        *,
+        processes: Optional[int] = 1
+    ) -> Dict[str, str]:
+        """Renders Markdown files, using the cache when possible.
+
+        With more than one process, hashing and rendering are fanned out to
+        a process pool.
+
+        Args:
+            files (List[str]): The file paths.
+            processes (int, optional): Worker processes. ``None`` uses the
+                CPU count; ``1`` renders in this process.
+
+        Returns:
+            Dict[str, str]: Rendered HTML for each file path.
+        """
+        if processes == 1 or len(files) < 2:
+            rendered = {}
+
+            for fp in files:
+                with open(fp, "r", encoding="utf-8") as f:
+                    rendered[fp] = self.render(f.read())
+
+            return rendered
+
+        workers = processes or os.cpu_count() or 1
+        chunksize = max(1, len(files) // (workers * 4))
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            keys = list(pool.map(
+                digest_file,
+                files,
+                repeat(self.salt),
+                chunksize=chunksize
+            ))
+            rendered = {}
+            missing = []
+
+            for fp, key in zip(files, keys):
+                cached = self.get(key)
+                if cached is None:
+                    missing.append((fp, key))
+                else:
+                    rendered[fp] = cached
+
+            self.hits += len(files) - len(missing)
+            self.misses += len(missing)
+
+            for (fp, key), html in zip(missing, pool.map(
+                render_file,
+                [fp for fp, _ in missing],
+                repeat(self.extras),
+                chunksize=chunksize
+            )):
+                self.put(key, html)
+                rendered[fp] = html
+
+        return rendered
+
+    def evict(self):
+        """Evicts stale entries, then the least recently used ones."""
+        deadline = time.time() - self.max_age
+
+        for key in [
+            key for key, (_, used) in self.entries.items() if used < deadline
+        ]:
+            del self.entries[key]
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def load(self) -> "MarkdownCache":
+        """Loads the cache from disk. A missing or broken file is ignored."""
+        if not os.path.exists(self.path):
+            return self
+
+        try:
+            with open(self.path, "rb") as f:
+                version, entries = pickle.load(f)
+
+        except Exception:
+            return self
+
+        if version == CACHE_VERSION:
+            self.entries = entries
+
+        return self
+
+    def save(self):
+        """Evicts entries, then saves the cache to disk."""
+        self.evict()
+        tmp = self.path + ".tmp"
+
+        with open(tmp, "wb") as f:
+            pickle.dump((CACHE_VERSION, self.entries), f)
+
+        os.replace(tmp, self.path)
@@ -0,0 +1,167 @@
+import itertools
+from typing import Any, Dict, Iterator, Optional, Union
+
+from ..api import Component
+from .broadcast import Subscriber
+from .routes import Params
+from .serialize import Channel
+
+#: Marks a connection without a python render to diff against.
+UNRENDERED: Any = object()
+
+
+class Connection:
+    """Represents a websocket connection viewing a page.
+
+    There's one per open tab, so it's kept small: the state lives in slots,
+    and the app renders through its own methods instead of closures created
+    for each connection.
+
+    Attributes:
+        id (int): The id, unique within the process.
+        app: The app rendering the page.
+        channel (Channel): The channel messages are sent through.
+        route (str): The route.
+        params (Params): The route parameters.
+        content (Union[str, Component], optional): The markdown, or the
+            component being rendered.
+        rendered: The previous python render, for diffing; or
+            :data:`UNRENDERED`.
+        rendering (bool): Whether a render is in progress; a streamed
+            render must be done before the next one starts.
+        stale (bool): Whether an update came in during the render, so it
+            must render again.
+        subscriber (Subscriber, optional): The subscription to updates of
+            the route.
+    """
+    __slots__ = (
+        "id",
+        "app",
+        "channel",
+        "route",
+        "params",
+        "content",
+        "rendered",
+        "rendering",
+        "stale",
+        "subscriber",
+    )
+    id: int
+    app: Any
+    channel: Channel
+    route: str
+    params: Params
+    content: Optional[Union[str, Component]]
+    rendered: Any
+    rendering: bool
+    stale: bool
+    subscriber: Optional[Subscriber]
+
+    def __init__(
+        self,
+        id: int,
+        app: Any,
+        channel: Channel,
+        route: str,
+        params: Params
+    ):
+        self.id = id
+        self.app = app
+        self.channel = channel
+        self.route = route
+        self.params = params
+        self.content = None
+        self.rendered = UNRENDERED
+        self.rendering = False
+        self.stale = False
+        self.subscriber = None
+
+    def set_content(self, content: Union[str, Component]):
+        """Sets the content, cancelling scriptings of the previous one.
+
+        Args:
+            content (Union[str, Component]): The markdown, or the component.
+        """
+        self.cancel_scripting()
+        self.content = content
+
+    def resolve_scripting(self, data: dict):
+        """Resolves a pending scripting of the component, if any.
+
+        Args:
+            data (dict): The received data (``type`` 2 or 2.1).
+        """
+        if isinstance(self.content, Component):
+            self.content.resolve_scripting(data)
+
+    def cancel_scripting(self):
+        """Cancels the pending scriptings of the component, if any."""
+        if isinstance(self.content, Component):
+            self.content.cancel_scripting()
+
+    async def update(self):
+        """Re-renders the page, e.g., after a reload."""
+        await self.app._update(self)
+
+    async def shed(self):
+        """Closes the connection as overloaded; the client retries later."""
+        await self.channel.close(code=1013)
+
+
+class ConnectionTable:
+    """Represents the open connections of a process, by id.
+
+    Attributes:
+        connections (Dict[int, Connection]): The connections.
+    """
+    __slots__ = (
+        "connections",
+        "_ids",
+    )
+    connections: Dict[int, Connection]
+    _ids: Iterator[int]
+
+    def __init__(self):
+        self.connections = {}
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def __iter__(self) -> Iterator[Connection]:
+        return iter(tuple(self.connections.values()))
+
+    def open(
+        self,
+        app: Any,
+        channel: Channel,
+        route: str,
+        params: Params
+    ) -> Connection:
+        """Opens a connection.
+
+        Args:
+            app: The app rendering the page.
+            channel (Channel): The channel messages are sent through.
+            route (str): The route.
+            params (Params): The route parameters.
+        """
+        conn = Connection(next(self._ids), app, channel, route, params)
+        self.connections[conn.id] = conn
+        return conn
+
+    def get(self, id: int) -> Optional[Connection]:
+        """Gets a connection by id.
+
+        Args:
+            id (int): The id.
+        """
+        return self.connections.get(id)
+
+    def close(self, conn: Connection):
+        """Removes a connection, e.g., once it's disconnected.
+
+        Args:
+            conn (Connection): The connection.
+        """
+        self.connections.pop(conn.id, None)
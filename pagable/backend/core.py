@@ -1,40 +1,209 @@
 import asyncio
+import multiprocessing
 import os
-import uuid
+import socket
+import time
 from contextlib import asynccontextmanager
-from typing import List, Union
+from multiprocessing.connection import Connection as Pipe
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    List,
+    Literal,
+    Set
+)
 
 import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse, HTMLResponse, Response
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse
+)
 from fastapi.routing import APIRoute, Optional
 from fastapi.staticfiles import StaticFiles
+from rich.markup import escape
 from watchfiles import Change, awatch
 
 from ..api import Component
-from ._const import here
-from ._logger import logger
-from .load import Mapping, ModuleMapping, map_source
+from ..exceptions import ConnectionRequired
+from ._const import console, here
+from ._logger import Level, LogFormat, logger
+from .diff import diff
+from .broadcast import Broadcaster, SlowPolicy
+from .cache import MarkdownCache
+from .connections import UNRENDERED, Connection, ConnectionTable
+from .load import (
+    MARKDOWN_EXTRAS,
+    Mapping,
+    ModuleMapping,
+    compile_routes,
+    map_file,
+    map_source,
+    normalize,
+    save_mapped
+)
+from .memo import RenderMemo, SharedRenders, is_pure, is_shared
+from .metrics import Metrics, Span
+from .modules import registry
+from .routes import Params, RouteTable, is_dynamic
+from .serialize import TAGS, Channel, Encoding, msgpack
+from .ssr import inject, render_html
+from .static import PublicIndex, StaticBody
 from .utils import get_extension
 
+Mode = Literal["dev", "production"]
+
+
+def log_span(span: Span):
+    logger.log(
+        f"[d white]trace[/] {span.name} {escape(span.route or '')} "
+        f"{span.duration * 1e3:.2f}ms"
+    )
+
+
+NOT_FOUND = "<!DOCTYPE html><title>404 Not Found</title><h1>404 Not Found</h1>"
+
 
 class App:
-    """Represents a Pagable application."""
+    """Represents a Pagable application.
+
+    Args:
+        cache_control (str, optional): The ``Cache-Control`` header for
+            ``index.html`` and ``app.js``. Defaults to ``no-cache``, so
+            clients revalidate with their ETag.
+        ssr (bool, optional): Whether to render pages on the server for the
+            first paint. The client then hydrates onto the rendered HTML.
+        send_timeout (float, optional): Seconds a connection may take to
+            receive a reloaded page.
+        slow_policy (SlowPolicy, optional): ``drop`` updates for slow
+            connections, or ``disconnect`` them.
+        encoding (Encoding, optional): The websocket message encoding:
+            ``json``, or ``msgpack`` (needs the ``msgpack`` package).
+        compression (bool, optional): Whether to negotiate permessage-deflate
+            on the websocket.
+        mode (Mode, optional): ``dev`` watches the source files and reloads
+            pages as they change. ``production`` loads everything once: the
+            route table is frozen, nothing is watched, and static responses
+            are computed at startup.
+        memo_size (int, optional): Renders of pure pages (see
+            :func:`pagable.pure`) kept in memory, and likewise for shared
+            pages (with ``__shared__ = True``).
+        diagnostics (bool, optional): Whether to serve ``/__diagnostics__``
+            (loaded modules, memory, connections and caches, as JSON).
+            Defaults to true in ``dev`` mode only.
+        metrics (bool, optional): Whether to record render latencies,
+            payload sizes, scripting round trips, connections and reloads,
+            and serve them on ``/__metrics__`` (Prometheus text format).
+        tracing (bool, optional): Whether to also log a span for each
+            render, scripting and reload; see :class:`Metrics`.
+        log_level (Level, optional): The minimum level to log.
+        log_format (LogFormat, optional): ``rich`` lines, or ``json`` lines.
+            Defaults to ``rich`` in ``dev`` mode, ``json`` in production.
+        map_processes (int, optional): Worker processes for mapping the
+            source files at startup. ``None`` uses the CPU count; ``1``
+            (default) maps sequentially, which is faster for small sites.
+    """
 
     __slots__ = (
         "app",
         "mapping",
         "module_mapping",
+        "routes",
+        "files",
+        "markdown_cache",
         "ws_route",
-        "ws_handlers"
+        "broadcaster",
+        "connections",
+        "cache_control",
+        "ssr",
+        "template",
+        "rendered",
+        "unrenderable",
+        "index",
+        "js",
+        "public",
+        "encoding",
+        "compression",
+        "memo",
+        "shared",
+        "pipe",
+        "mode",
+        "metrics",
+        "map_processes",
     )
     app: FastAPI
     mapping: Mapping
     module_mapping: ModuleMapping
+    routes: RouteTable
+    files: Dict[str, str]
+    markdown_cache: MarkdownCache
     ws_route: str
-    ws_handlers: dict
+    broadcaster: Broadcaster
+    connections: ConnectionTable
+    cache_control: str
+    ssr: bool
+    template: str
+    rendered: Dict[str, StaticBody]
+    unrenderable: Set[str]  # routes that need a connection to render
+    index: StaticBody
+    js: StaticBody
+    public: PublicIndex
+    encoding: Encoding
+    compression: bool
+    memo: RenderMemo
+    shared: SharedRenders
+    pipe: Optional[Pipe]
+    mode: Mode
+    metrics: Optional[Metrics]
+    map_processes: Optional[int]
+
+    def __init__(
+        self,
+        *,
+        cache_control: str = "no-cache",
+        ssr: bool = False,
+        send_timeout: float = 5.0,
+        slow_policy: SlowPolicy = "drop",
+        encoding: Encoding = "json",
+        compression: bool = True,
+        mode: Mode = "dev",
+        memo_size: int = 1024,
+        diagnostics: Optional[bool] = None,
+        metrics: bool = False,
+        tracing: bool = False,
+        log_level: Level = "info",
+        log_format: Optional[LogFormat] = None,
+        map_processes: Optional[int] = 1
+    ):
+        if encoding == "msgpack" and msgpack is None:
+            console.print(
+                "[red b]encoding='msgpack' needs the msgpack package[/] "
+                "(pip install msgpack)"
+            )
+            raise ImportError("msgpack")
 
-    def __init__(self):
+        self.mode = mode
+        self.map_processes = map_processes
+        logger.configure(
+            level=log_level,
+            format=log_format or ("rich" if mode == "dev" else "json")
+        )
+        self.metrics = (
+            Metrics(tracing=tracing, on_span=log_span)
+            if metrics or tracing else None
+        )
+        self.encoding = encoding
+        self.compression = compression
+        self.memo = RenderMemo(memo_size)
+        self.shared = SharedRenders(memo_size)
+        self.pipe = None # changes from the watching process, in workers
+        self.cache_control = cache_control
+        self.ssr = ssr
+        self.rendered = {}
+        self.unrenderable = set()
         self.app = FastAPI(
             docs_url=None, 
             redoc_url=None,
@@ -55,195 +224,798 @@ class App:
             self.ws_route,
             self._ws_handler
         )
-        self.ws_handlers = {}
+        self.broadcaster = Broadcaster(
+            timeout=send_timeout,
+            slow_policy=slow_policy
+        )
+        self.connections = ConnectionTable()
         
         self.app.router.add_api_route(
             "/app.js",
             self._js_delivery,
         )
+        if self.metrics is not None:
+            self.app.router.add_api_route(
+                "/__metrics__",
+                self._metrics
+            )
+        if mode == "dev" if diagnostics is None else diagnostics:
+            self.app.router.add_api_route(
+                "/__diagnostics__",
+                self._diagnostics
+            )
         self.app.router.add_api_route(
             "/{full_path:path}",
             self._app_handler
         )
         self.load_files()
 
-    async def _app_handler(self, full_path: Optional[str] = None):
+    async def _app_handler(
+        self,
+        request: Request,
+        full_path: Optional[str] = None
+    ):
         if full_path:
-            static = os.path.join('./public', full_path)
-            if os.path.exists(static):
-                return FileResponse(static)
+            static = self.public.get(full_path)
+            if static is not None:
+                return await static.respond(request)
+
+        resolved = self.routes.resolve(full_path or "")
+        if resolved is None:
+            return HTMLResponse(NOT_FOUND, status_code=404)
+
+        if self.ssr:
+            page = await self._render(*resolved)
+            if page is not None:
+                return page.respond(request)
+
+        return self.index.respond(request)
+
+    async def _render(
+        self,
+        route: str,
+        params: Params
+    ) -> Optional[StaticBody]:
+        if route in self.rendered:
+            return self.rendered[route]
+
+        entry = self.mapping[route]
+        body: Optional[str]
+        if entry['type'] == "md":
+            body = entry['ctnt']
+        elif route in self.unrenderable:
+            return None
+        else:
+            body = await self._pre_render(
+                route,
+                self.module_mapping[route],
+                params
+            )
 
-        with open(
-            "index.html", 
-            "r", 
-            encoding="utf-8"
-        ) as f:
-            return HTMLResponse(f.read())
+        if body is None:
+            return None
 
-    async def _js_delivery(self):
-        with open(
-            os.path.join(here, "script.js"),
-            "r", 
-            encoding="utf-8"
-        ) as f:
-            return Response(
-                f.read().replace("${WS_URL}", self.ws_route),
-                headers={
-                    "Content-Type": "application/javascript"
-                }
+        page = inject(
+            self.template,
+            body,
+            getattr(entry['ctnt'], "metadata", None)
+        )
+        if page is None:
+            return None
+
+        response = StaticBody(
+            page.encode(),
+            "text/html",
+            cache_control=self.cache_control
+        )
+
+        # markdown never changes between reloads
+        if entry['type'] == "md":
+            self.rendered[route] = response
+
+        return response
+
+    async def _pre_render(
+        self,
+        route: str,
+        mod: Any,
+        params: Params
+    ) -> Optional[str]:
+        """Renders a python page to HTML, without a client connection.
+
+        Shared and pure pages reuse the renders sent to connections. Pages
+        that can't be rendered without a connection are remembered, so they
+        don't run on every request.
+
+        Returns ``None`` if the page can't be pre-rendered.
+        """
+        try:
+            if is_shared(mod):
+                shared = await self.shared.get(
+                    route,
+                    params,
+                    lambda: self._render_shared(route, mod, params),
+                    getattr(mod, "__ttl__", None)
+                )
+                if shared is None:
+                    self.unrenderable.add(route)
+                    return None
+
+                return render_html(shared.content)
+
+            comp = Component(mod.handle, params)
+            if is_pure(mod):
+                contents = await self._memoized(route, params, comp)
+            else:
+                contents = await comp()
+
+        except ConnectionRequired:
+            self.unrenderable.add(route)
+            return None
+
+        except Exception as err:
+            logger.error(
+                f"[red]ERROR (pre-render failed)[/] {escape(str(err))}",
+                key="pre-render"
             )
+            return None
+
+        return render_html(contents)
+
+    async def _js_delivery(self, request: Request):
+        return self.js.respond(request)
+
+    async def _metrics(self):
+        return PlainTextResponse(
+            self.metrics.export(self.broadcaster.stats), # type: ignore
+            media_type="text/plain; version=0.0.4"
+        )
+
+    async def _diagnostics(self):
+        return JSONResponse({
+            "mode": self.mode,
+            "modules": registry.stats(),
+            "routes": len(self.routes.static) + len(self.routes.names),
+            "connections": len(self.connections),
+            "caches": {
+                "markdown": len(self.markdown_cache.entries),
+                "memo": len(self.memo.entries),
+                "shared": len(self.shared.entries),
+                "rendered": len(self.rendered),
+                "public": len(self.public),
+            },
+        })
 
     async def _ws_handler(self, ws: WebSocket):
         await ws.accept()
-        c = await ws.receive_json()
-        route = c['path']
-        state: List[Union[str, Component]] = []
-
-        def set_ctnt(val):
-            state.clear()
-            state.append(val)
-
-        async def update(route: str, *, initial: bool = False):
-            #logger.log("[blue]UPDATE[/]")
-            typ = self.mapping[route]['type']
-            data = {
-                "type": 1,
-                "meta": {},
-                "initial": initial
-            }
-
-            if typ == "md":
-                contents = self.mapping[route]['ctnt']
-                set_ctnt(contents)
-
-                await ws.send_json(
-                    data | {
-                        "ctyp": "md",
-                        "ctnt": contents,
-                        "meta": contents.metadata # type: ignore
-                    }
+        channel = Channel(ws, self.encoding, self.metrics)
+        c = await channel.receive()
+        resolved = self.routes.resolve(c['path'])
+
+        if resolved is None:
+            await ws.close(code=4404)
+            return
+
+        route, params = resolved
+        channel.route = route
+        conn = self.connections.open(self, channel, route, params)
+
+        # the initial render runs alongside the receive loop, so that
+        # scriptings made while rendering can be answered
+        render = asyncio.create_task(self._first_render(conn))
+
+        conn.subscriber = self.broadcaster.subscribe(
+            route,
+            conn.update,
+            conn.shed # try again later
+        )
+        if self.metrics is not None:
+            self.metrics.connections += 1
+
+        try:
+            while True:
+                data = await channel.receive()
+                # anything else from the client is ignored
+                if isinstance(data, dict) and data.get('type') in (2, 2.1):
+                    conn.resolve_scripting(data)
+
+        except WebSocketDisconnect:
+            pass
+
+        finally:
+            self.broadcaster.unsubscribe(conn.subscriber)
+            render.cancel()
+            conn.cancel_scripting()
+            self.connections.close(conn)
+            if self.metrics is not None:
+                self.metrics.connections -= 1
+
+    async def _first_render(self, conn: Connection):
+        try:
+            await self._update(conn, initial=True)
+        except Exception as err:
+            logger.error(f"[red]ERROR[/] {escape(str(err))}", key="render")
+            await conn.channel.close()
+
+    async def _update(self, conn: Connection, *, initial: bool = False):
+        """Renders the page of a connection and sends it.
+
+        Args:
+            conn (Connection): The connection.
+            initial (bool, optional): Whether it's the first render.
+        """
+        if conn.rendering:
+            # e.g., the first render waits on a scripting; rather than wait
+            # here (under the delivery timeout), render again once it's done
+            conn.stale = True
+            return
+
+        # a streamed render must be done before the next one starts
+        conn.rendering = True
+        try:
+            while True:
+                conn.stale = False
+
+                if self.metrics is None:
+                    await self._render_update(conn, initial)
+                else:
+                    started = time.perf_counter()
+                    await self._render_update(conn, initial)
+                    self.metrics.observe_render(
+                        conn.route,
+                        time.perf_counter() - started
+                    )
+
+                if not conn.stale:
+                    return
+
+                initial = False
+
+        finally:
+            conn.rendering = False
+
+    async def _render_update(self, conn: Connection, initial: bool):
+        #logger.log("[blue]UPDATE[/]")
+        route = conn.route
+        channel = conn.channel
+
+        if route not in self.mapping:
+            # the page was deleted
+            await channel.close(code=4404)
+            return
+
+        typ = self.mapping[route]['type']
+        data = {
+            "type": 1,
+            "meta": {},
+            "initial": initial
+        }
+
+        if typ == "md":
+            contents = self.mapping[route]['ctnt']
+            conn.set_content(contents)
+            conn.rendered = UNRENDERED
+
+            await channel.send(
+                data | {
+                    "ctyp": "md",
+                    "ctnt": contents,
+                    "meta": contents.metadata # type: ignore
+                }
+            )
+
+        elif typ == "py":
+            mod = self.module_mapping[route]
+            params = conn.params
+            comp = Component(mod.handle, params)
+            comp.__ws__ = channel
+            conn.set_content(comp)
+
+            # only kept once sent: if a send is cancelled (e.g., timed out),
+            # the client's tree is unknown, so the next render is a full one
+            previous = conn.rendered
+            rendered = previous is not UNRENDERED
+            conn.rendered = UNRENDERED
+
+            pure = is_pure(mod)
+            shared = (
+                await self.shared.get(
+                    route,
+                    params,
+                    lambda: self._render_shared(route, mod, params),
+                    getattr(mod, "__ttl__", None)
                 )
+                if is_shared(mod) else None
+            )
 
-            elif typ == "py":
-                mod = self.module_mapping[route]
-                comp = Component(mod.handle)
-                comp.__ws__ = ws
-                set_ctnt(comp)
+            if shared is not None and not rendered:
+                # encoded once, sent to every connection
+                frame = shared.frames.get(initial)
+                if frame is None:
+                    frame = shared.frames[initial] = channel.encode(
+                        data | {
+                            "ctyp": "py",
+                            "ctnt": shared.content,
+                            "requires": getattr(mod, "requires", [])
+                        }
+                    )
 
-                await ws.send_json(
+                await channel.send_encoded(frame)
+                conn.rendered = shared.content
+                return
+
+            if rendered or pure or shared is not None:
+                if shared is not None:
+                    contents = shared.content
+                elif pure:
+                    contents = await self._memoized(route, params, comp)
+                else:
+                    contents = await comp()
+
+                if not rendered:
+                    await channel.send(
+                        data | {
+                            "ctyp": "py",
+                            "ctnt": contents,
+                            "requires": getattr(mod, "requires", [])
+                        }
+                    )
+                    conn.rendered = contents
+                    return
+
+                patches = diff(previous, contents)
+                if patches:
+                    await channel.send({
+                        "type": 3,
+                        "ctnt": patches
+                    })
+
+                conn.rendered = contents
+                return
+
+            # each send is awaited before the next chunk is rendered, so
+            # the render keeps pace with the socket
+            chunks: AsyncGenerator[Any, None] = comp.stream()
+            try:
+                try:
+                    first = await chunks.__anext__()
+                except StopAsyncIteration:
+                    first = []
+
+                await channel.send(
                     data | {
                         "ctyp": "py",
-                        "ctnt": await comp(),
-                        "requires": getattr(mod, "requires", [])
+                        "ctnt": first,
+                        "requires": getattr(mod, "requires", []),
+                        "stream": comp.streamed
                     }
                 )
 
-        try:
-            await update(route, initial=True)
-        except Exception as err:
-            logger.log(
-                f"[red]ERROR[/] {err}"
-            )
-            raise err
-            return
-        
-        if isinstance(state[0], Component):
-            state[0].first_rendered = True
+                if not comp.streamed:
+                    conn.rendered = first
+                    return
 
-        @self.ws_handle()
-        async def handler(next_route: str):
-            if next_route == route:
-                await update(route)
+                streamed = [first]
+                async for chunk in chunks:
+                    streamed.append(chunk)
+                    await channel.send({"type": 4, "ctnt": chunk})
+
+                await channel.send({"type": 4, "done": True})
+                conn.rendered = streamed
+
+            finally:
+                await chunks.aclose()
+
+    async def _memoized(
+        self,
+        route: str,
+        params: Params,
+        comp: Component
+    ) -> Any:
+        """Renders a pure component, reusing a cached render if possible."""
+        key = self.memo.key(route, params, comp.states)
+        contents = None if key is None else self.memo.get(key)
+
+        if contents is None:
+            contents = await comp()
+
+            if key is not None:
+                self.memo.put(key, contents)
+
+        return contents
+
+    async def _render_shared(
+        self,
+        route: str,
+        mod: Any,
+        params: Params
+    ) -> Any:
+        """Renders a shared page without a connection.
+
+        Returns ``None`` if the page uses state or frontend APIs, thus can't
+        be shared.
+        """
+        comp = Component(mod.handle, params)
 
         try:
-            while True:
-                data = await ws.receive_json()
-                if data['type'] == 2 and isinstance(state[0], Component):
-                    print("type 2")
-                    print(data)
-                    state[0].pending_data = data
+            contents = await comp()
+        except ConnectionRequired:
+            logger.error(
+                f"[red]ERROR (cannot share)[/] {escape(route)} uses "
+                "frontend APIs"
+            )
+            return None
 
-                elif data['type'] == 2.1 and isinstance(state[0], Component):
-                    raise BaseException
+        if comp.states:
+            logger.error(
+                f"[red]ERROR (cannot share)[/] {escape(route)} uses state"
+            )
+            return None
 
-        except WebSocketDisconnect:
-            handler.remove()
+        return contents
 
     async def emit(self, route: str):
-        for handler in self.ws_handlers.values():
-            await handler(route)
-
-    def ws_handle(self):
-        def wrapper(func):
-            _id = str(uuid.uuid4())
-            self.ws_handlers[_id] = func
-    
-            class Handler:
-                @staticmethod
-                def remove():
-                    del self.ws_handlers[_id]
-    
-            return Handler
-
-        return wrapper
+        """Re-renders a route for every connection viewing it.
+
+        Args:
+            route (str): The route.
+        """
+        await self.broadcaster.emit(route)
 
     async def _background_runner(self):
-        async for changes in awatch(
-            "./src/pages", 
-            #"index.html",
-            poll_delay_ms=500
-        ):
-            for change in changes:
-                if change == Change.deleted:
-                    continue
-
-                diff, filename = change
-                try:
-                    mapped, modules = map_source(only=filename)
-                except Exception as err:
+        async for latest in self._watch():
+            await self._apply(latest)
+
+    async def _watch(self) -> AsyncIterator[Dict[str, Change]]:
+        """Watches the source files; yields the latest change of each file."""
+        paths = ["./src/pages", "index.html"]
+        if os.path.isdir("./public"):
+            paths.append("./public")
+
+        # awatch debounces bursts of edits into one set of changes
+        async for changes in awatch(*paths, poll_delay_ms=500):
+            # only the last change of each file matters
+            latest: Dict[str, Change] = {}
+            for change, filename in changes:
+                latest[normalize(os.path.abspath(filename))] = change
+
+            yield latest
+
+    async def _apply(
+        self,
+        latest: Dict[str, Change],
+        *,
+        primary: bool = True
+    ):
+        """Applies file changes, then re-renders the affected routes.
+
+        Args:
+            latest (Dict[str, Change]): The latest change of each file.
+            primary (bool, optional): Whether this process logs the changes
+                and persists the caches. Workers only apply them.
+        """
+        index = normalize(os.path.abspath("index.html"))
+
+        for filename, change in latest.items():
+            if filename == index:
+                self.load_static()
+                self.rendered.clear()
+                if primary:
+                    logger.log("[blue]update[/] index.html")
+                continue
+
+            if self.public.contains(filename):
+                self.public.refresh(filename)
+                if primary:
                     logger.log(
-                        "[red]ERROR (reload failed)[/] " + 
-                        str(err)
+                        f"[blue]{change.name}[/] "
+                        f"{escape(os.path.relpath(filename))}"
                     )
-                    continue
-
-                route = mapped['$new']['route']
+                continue
+
+            started = time.perf_counter()
+            try:
+                routes = self._reload(filename, change)
+            except Exception as err:
+                logger.error(
+                    "[red]ERROR (reload failed)[/] " + 
+                    escape(str(err))
+                )
+                continue
 
-                if filename.endswith(".py"):
-                    self.module_mapping[route] = modules[route]
+            if self.metrics is not None:
+                self.metrics.observe_reload(
+                    routes[0] if routes else None,
+                    time.perf_counter() - started
+                )
 
-                self.mapping.update(mapped)
+            if not routes:
+                continue
 
-                try:
+            try:
+                for route in routes:
                     await self.emit(route)
-                except Exception as err:
-                    logger.log(
-                        "[red]ERROR (cannot emit)[/] " + str(err)
-                    )
-                    continue
-                
-                _, emoji = get_extension(filename)
-                logger.log(
-                    f"{emoji + (' ' if emoji else '')}"
-                    f"[blue]update[/] {os.path.relpath(filename)}"
+            except Exception as err:
+                logger.error(
+                    "[red]ERROR (cannot emit)[/] " + escape(str(err)),
+                    key="emit"
                 )
+                continue
+
+            if not primary:
+                continue
+
+            _, emoji = get_extension(filename)
+            logger.log(
+                f"{emoji + (' ' if emoji else '')}"
+                f"[blue]{change.name}[/] {escape(os.path.relpath(filename))}"
+            )
+
+        if not primary:
+            return
+
+        # persist off the event loop; the snapshot keeps it consistent
+        snapshot = dict(self.mapping)
+        try:
+            await asyncio.to_thread(self._persist, snapshot)
+        except Exception as err:
+            logger.error(
+                "[red]ERROR (cannot save cache)[/] " + escape(str(err)),
+                key="persist"
+            )
+
+    async def _follow(self, pipe: Pipe):
+        """Applies the changes the watching process sends (in workers)."""
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        loop.add_reader(pipe.fileno(), readable.set)
+
+        try:
+            while True:
+                await readable.wait()
+                readable.clear()
+
+                while pipe.poll():
+                    await self._apply(dict(pipe.recv()), primary=False)
+
+        except EOFError:
+            # the watching process is gone
+            return
+
+        finally:
+            loop.remove_reader(pipe.fileno())
+
+    async def _forward(self, pipes: List[Pipe]):
+        """Watches the source files for every worker (in the master)."""
+        async for latest in self._watch():
+            await self._apply(latest)
+
+            for pipe in pipes:
+                try:
+                    pipe.send(list(latest.items()))
+                except OSError:
+                    # the worker is gone
+                    pass
+
+    def _reload(self, filename: str, change: Change) -> List[str]:
+        """Reloads a single changed file in memory.
+
+        Args:
+            filename (str): The (absolute) file path.
+            change (Change): The change.
+
+        Returns:
+            List[str]: The affected routes: the route of the file, and its
+                previous route if it moved or was deleted.
+        """
+        previous = self.files.pop(filename, None)
+
+        if change == Change.deleted:
+            registry.unload(filename)
+            if previous is None:
+                return []
+
+            self._remove_route(previous)
+            return [previous]
+
+        mapped = map_file(filename, cache=self.markdown_cache)
+        if mapped is None:
+            return []
+
+        route, entry, mod = mapped
+        routes = [route]
+
+        # e.g., its __route__ changed; viewers of the old one are closed
+        if previous is not None and previous != route:
+            self._remove_route(previous)
+            routes.append(previous)
+
+        self.mapping[route] = entry
+        self.files[filename] = route
+        self.routes.add(route)
+        self.rendered.pop(route, None)
+        self.unrenderable.discard(route)
+        self.memo.invalidate(route)
+        self.shared.invalidate(route)
+
+        if mod is not None:
+            self.module_mapping[route] = mod
+        else:
+            self.module_mapping.pop(route, None)
+
+        return routes
+
+    def _remove_route(self, route: str):
+        self.mapping.pop(route, None)
+        self.module_mapping.pop(route, None)
+        self.routes.remove(route)
+        self.rendered.pop(route, None)
+        self.unrenderable.discard(route)
+        self.memo.invalidate(route)
+        self.shared.invalidate(route)
+
+    def _persist(self, mapping: Mapping):
+        save_mapped(mapping)
+        self.markdown_cache.save()
 
     @asynccontextmanager
     async def _lifespan(self, _: FastAPI):
-        asyncio.create_task(self._background_runner())
-        logger.log("running app")
+        if self.mode == "production":
+            await self._precompute()
+            if self.pipe is None:
+                logger.log("running app (production)")
+
+        elif self.pipe is None:
+            asyncio.create_task(self._background_runner())
+            logger.log("running app")
+
+        else:
+            asyncio.create_task(self._follow(self.pipe))
+
         yield
 
+    async def _precompute(self):
+        """Renders what can be rendered ahead of time (production mode)."""
+        for route, entry in self.mapping.items():
+            if route.startswith("$") or is_dynamic(route):
+                continue
+
+            try:
+                if self.ssr and entry['type'] == "md":
+                    await self._render(route, {})
+
+                mod = self.module_mapping.get(route)
+                if mod is not None and is_shared(mod):
+                    await self.shared.get(
+                        route,
+                        {},
+                        lambda: self._render_shared(route, mod, {}),
+                        getattr(mod, "__ttl__", None)
+                    )
+
+            except Exception as err:
+                logger.error(
+                    f"[red]ERROR (cannot precompute {escape(route)})[/] "
+                    f"{escape(str(err))}"
+                )
+
     def load_files(self):
         """Loads files."""
-        mapping, modules = map_source()
+        self.markdown_cache = MarkdownCache(extras=MARKDOWN_EXTRAS).load()
+        mapping, modules = map_source(
+            cache=self.markdown_cache,
+            processes=self.map_processes
+        )
         self.mapping = mapping
         self.module_mapping = modules
+        self.routes = compile_routes(mapping)
+        if self.mode == "production":
+            self.routes.freeze()
+
+        self.files = {
+            entry['file']: route
+            for route, entry in mapping.items()
+            if not route.startswith("$")
+        }
+        self.load_static()
+        self.public = PublicIndex("./public").build()
+
+    def load_static(self):
+        """Loads ``index.html`` and ``app.js`` into memory."""
+        with open("index.html", "r", encoding="utf-8") as f:
+            self.template = f.read()
+            self.index = StaticBody(
+                self.template.encode(),
+                "text/html",
+                cache_control=self.cache_control
+            )
+
+        with open(
+            os.path.join(here, "script.js"),
+            "r",
+            encoding="utf-8"
+        ) as f:
+            self.js = StaticBody(
+                f.read()
+                .replace("${WS_URL}", self.ws_route)
+                .replace("${TAGS}", ",".join(TAGS))
+                .replace("${ENCODING}", self.encoding)
+                .encode(),
+                "application/javascript",
+                cache_control=self.cache_control
+            )
 
-    def run(self):
-        uvicorn.run(
+    def run(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        workers: int = 1
+    ):
+        """Runs the app.
+
+        With more than one worker, worker processes are forked after the
+        pages are loaded (so they share the loaded mapping), and serve the
+        same socket. This process then watches the source files and sends
+        the changes to every worker, so each one re-renders its own
+        connections. Forking needs a POSIX system.
+
+        Args:
+            host (str, optional): The host.
+            port (int, optional): The port.
+            workers (int, optional): Worker processes.
+        """
+        config = uvicorn.Config(
             self.app,
-            host="0.0.0.0", 
-            port=8080,
+            host=host,
+            port=port,
+            ws_per_message_deflate=self.compression,
             #log_level=50 # fatal
         )
+
+        if workers <= 1:
+            uvicorn.Server(config).run()
+            return
+
+        sock = config.bind_socket()
+        context = multiprocessing.get_context("fork")
+        pipes: List[Pipe] = []
+        processes = []
+
+        for _ in range(workers):
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=self._serve_worker,
+                args=(config, sock, receiver),
+                daemon=True
+            )
+            process.start()
+            receiver.close()
+            pipes.append(sender)
+            processes.append(process)
+
+        logger.log(f"running app ({workers} workers, {self.mode})")
+
+        try:
+            if self.mode == "production":
+                for process in processes:
+                    process.join()
+            else:
+                asyncio.run(self._forward(pipes))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+
+            sock.close()
+
+    def _serve_worker(
+        self,
+        config: uvicorn.Config,
+        sock: socket.socket,
+        pipe: Pipe
+    ):
+        self.pipe = pipe
+        uvicorn.Server(config).run(sockets=[sock])
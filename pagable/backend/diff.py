@@ -0,0 +1,175 @@
+from typing import Any, Dict, List, Optional
+
+from ..elements import Element
+
+Node = Any  # str | Element
+Patch = Dict[str, Any]
+
+
+def normalize(content: Any) -> List[Node]:
+    """Normalizes rendered content into a flat list of DOM nodes.
+
+    This mirrors what ``parseMapping`` in ``script.js`` produces: nested lists
+    become fragments (thus flattened), strings become paragraphs and elements
+    stay elements. See :func:`children` for the children of an element.
+
+    Args:
+        content (Any): The rendered content.
+
+    Returns:
+        List[Node]: The nodes, in DOM order.
+    """
+    if isinstance(content, list):
+        nodes = []
+        for item in content:
+            nodes.extend(normalize(item))
+
+        return nodes
+
+    return [content]
+
+
+def children(node: Element) -> List[Node]:
+    """Gets the DOM children of an element.
+
+    Strings inside an element render as text nodes, so empty ones render
+    nothing at all.
+
+    Args:
+        node (Element): The element.
+
+    Returns:
+        List[Node]: The child nodes, in DOM order.
+    """
+    return [child for child in node.nodes if child != ""]
+
+
+def _key(node: Node) -> Optional[str]:
+    if isinstance(node, Element):
+        return node.attrs.get("key")
+
+    return None
+
+
+def _keyed(nodes: List[Node]) -> bool:
+    keys = [_key(node) for node in nodes]
+    return None not in keys and len(set(keys)) == len(keys)
+
+
+def diff(old: Any, new: Any) -> List[Patch]:
+    """Computes a patch list that turns the ``old`` render into ``new``.
+
+    Patches are applied in order by the client. Each patch has an ``op`` and a
+    ``path`` (child indices, starting from ``#root``):
+
+    - ``insert``: Inserts ``node`` at ``path``.
+    - ``remove``: Removes the node at ``path``.
+    - ``move``: Moves the child at index ``from`` of ``path`` to index ``to``.
+    - ``replace``: Replaces the node at ``path`` with ``node``.
+    - ``attr``: Sets attribute ``name`` to ``value`` (removes it if ``None``).
+    - ``text``: Sets the text of the node at ``path`` to ``value``.
+
+    Children whose attributes all carry a unique ``key`` are matched by key,
+    otherwise by position.
+
+    Args:
+        old (Any): The previously rendered content.
+        new (Any): The newly rendered content.
+
+    Returns:
+        List[Patch]: The patches.
+    """
+    patches: List[Patch] = []
+    _diff_children(normalize(old), normalize(new), [], patches)
+    return patches
+
+
+def _diff_node(old: Node, new: Node, path: List[int], patches: List[Patch]):
+    if isinstance(old, str) and isinstance(new, str):
+        if old != new:
+            patches.append({"op": "text", "path": path, "value": new})
+        return
+
+    if (
+        not isinstance(old, Element)
+        or not isinstance(new, Element)
+        or old.tag != new.tag
+        or _key(old) != _key(new)
+    ):
+        patches.append({"op": "replace", "path": path, "node": new})
+        return
+
+    old_attrs, new_attrs = old.attrs, new.attrs
+
+    for name, value in new_attrs.items():
+        if old_attrs.get(name) != value:
+            patches.append(
+                {"op": "attr", "path": path, "name": name, "value": value}
+            )
+
+    for name in old_attrs:
+        if name not in new_attrs:
+            patches.append(
+                {"op": "attr", "path": path, "name": name, "value": None}
+            )
+
+    _diff_children(children(old), children(new), path, patches)
+
+
+def _diff_children(
+    old: List[Node],
+    new: List[Node],
+    path: List[int],
+    patches: List[Patch]
+):
+    if old and new and _keyed(old) and _keyed(new):
+        return _diff_keyed(old, new, path, patches)
+
+    for index, (o, n) in enumerate(zip(old, new)):
+        _diff_node(o, n, path + [index], patches)
+
+    for index in range(len(old), len(new)):
+        patches.append(
+            {"op": "insert", "path": path + [index], "node": new[index]}
+        )
+
+    for index in reversed(range(len(new), len(old))):
+        patches.append({"op": "remove", "path": path + [index]})
+
+
+def _diff_keyed(
+    old: List[Node],
+    new: List[Node],
+    path: List[int],
+    patches: List[Patch]
+):
+    by_key = {_key(node): node for node in old}
+    new_keys = {_key(node) for node in new}
+
+    # the keys in DOM order, as the client will see them
+    working = [_key(node) for node in old]
+
+    for index in reversed(range(len(working))):
+        if working[index] not in new_keys:
+            patches.append({"op": "remove", "path": path + [index]})
+            del working[index]
+
+    for index, node in enumerate(new):
+        key = _key(node)
+
+        if key not in by_key:
+            patches.append(
+                {"op": "insert", "path": path + [index], "node": node}
+            )
+            working.insert(index, key)
+            continue
+
+        current = working.index(key, index)
+        if current != index:
+            patches.append(
+                {"op": "move", "path": path, "from": current, "to": index}
+            )
+            del working[current]
+            working.insert(index, key)
+
+        _diff_node(by_key[key], node, path + [index], patches)
@@ -1,133 +1,232 @@
 import os
 import pickle
-import uuid
-from importlib.machinery import SourceFileLoader
+from inspect import isasyncgenfunction
 from inspect import iscoroutinefunction as iscoro
 from types import ModuleType
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, List, Tuple, Union
 
-import markdown2
 from rich.console import Optional
+from rich.markup import escape
 
 from ._const import console, instance_id
+from .cache import MarkdownCache
+from .modules import registry
+from .routes import RouteTable
 
 Mapping = Dict[str, Dict[str, str]]
 ModuleMapping = Dict[str, ModuleType]
 
+MARKDOWN_EXTRAS = ["metadata", "spoiler"]
 
-def load(path: str) -> ModuleType:
+
+def load(path: str, source: str = "./src/") -> ModuleType:
     """(Re)loads a (file) module from a file path.
 
-    Usually used for ``src/<file>``.
+    Usually used for ``src/<file>``. The module replaces its previous version
+    in ``sys.modules``; see :class:`ModuleRegistry`.
 
     Args:
         path (str): The file path.
+        source (str): The source path. Usually ``./src/``.
     """
-    return SourceFileLoader(str(uuid.uuid4()), path).load_module()
+    return registry.load(path, route_for(path, source) or path)
 
 
 def normalize(path: str) -> str:
     return path.replace("\\", "/")
 
 
+def route_for(fp: str, source: str = "./src/") -> Optional[str]:
+    """Gets the route of a page file, derived from its path.
+
+    Args:
+        fp (str): The file path.
+        source (str): The source path. Usually ``./src/``.
+
+    Returns:
+        Optional[str]: The route, or ``None`` if it's not a page.
+    """
+    if not fp.endswith((".md", ".py")):
+        return None
+
+    absp = normalize(os.path.abspath(source))
+    rel: str = normalize(os.path.abspath(fp))[len(absp):]
+    route: str = rel[len("/pages"):][:-3]
+    return route[:-5] if route.endswith("/index") else (route + "/")
+
+
+def map_page(
+    fp: str,
+    route: str,
+    html: Optional[str] = None
+) -> Tuple[str, Dict[str, Any], Optional[ModuleType]]:
+    """Maps a single page.
+
+    Args:
+        fp (str): The file path.
+        route (str): The route derived from the path.
+        html (str, optional): The rendered Markdown, for ``.md`` pages.
+
+    Returns:
+        Tuple[str, Dict[str, Any], Optional[ModuleType]]: The route (which
+            python pages may override with ``__route__``), the mapping entry
+            and the loaded module, if any.
+    """
+    if fp.endswith(".md"):
+        return route, {
+            "type": "md",
+            "file": fp,
+            "ctnt": html
+        }, None
+
+    mod = registry.load(fp, route)
+    route = getattr(mod, "__route__", route)
+    cnt = getattr(mod, "handle", None)
+
+    if not cnt:
+        console.print(
+            f"[red b]Cannot find coro handle() for {escape(route)}[/] "
+            f"[white d u]{escape(fp)}[/]"
+        )
+        raise AttributeError
+
+    elif not (iscoro(cnt) or isasyncgenfunction(cnt)):
+        console.print(
+            "[red b]export handle() is not coroutine[/]"
+        )
+        raise TypeError
+
+    return route, {
+        "type": "py",
+        "file": fp,
+        "ctnt": "<load>"
+    }, mod
+
+
+def map_file(
+    fp: str,
+    source: str = "./src/",
+    *,
+    cache: MarkdownCache
+) -> Optional[Tuple[str, Dict[str, Any], Optional[ModuleType]]]:
+    """Maps a single file, e.g., after it changed.
+
+    Args:
+        fp (str): The file path.
+        source (str): The source path. Usually ``./src/``.
+        cache (MarkdownCache): The Markdown render cache.
+
+    Returns:
+        The same as :func:`map_page`, or ``None`` if the file is not a page.
+    """
+    route = route_for(fp, source)
+    if route is None:
+        return None
+
+    html = None
+    if fp.endswith(".md"):
+        with open(fp, "r", encoding="utf-8") as f:
+            html = cache.render(f.read())
+
+    return map_page(normalize(fp), route, html)
+
+
 def map_source(
     source: str = "./src/",
     *,
-    only: Optional[str] = None,
     save: bool = True,
+    cache: Optional[MarkdownCache] = None,
+    processes: Optional[int] = 1,
 ) -> Tuple[Mapping, ModuleMapping]:
     """Maps source files for later use.
 
     Args:
         source (str): The source path. Usually ``./src/``.
-        only (str): Only for a specific file (e.g., ``src/pages/index.py``)
         save (bool, optional): Whether to save to cache.
+        cache (MarkdownCache, optional): The Markdown render cache. Loaded
+            from disk if not given.
+        processes (int, optional): Worker processes for hashing and rendering
+            Markdown. ``None`` uses the CPU count; ``1`` (default) maps
+            sequentially. Python pages are always imported in this process.
 
     Returns:
         Tuple[Mapping, ModuleMapping]: Returns a mapping dictionary and a module 
             mapping. It's generated when loading python files.
     """
-    mapped: Mapping = get_mapped() if only else {
+    mapped: Mapping = {
         "$instance": {
             "id": instance_id
         }
     }
     module_mapping: ModuleMapping = {}
-    absp = os.path.abspath(source)
-    abspl = len(absp)  # abs path length
+    cache = cache or MarkdownCache(extras=MARKDOWN_EXTRAS).load()
+    entries: List[Tuple[str, str]] = []  # (file path, route)
+
+    for base, dirs, filenames in os.walk(os.path.abspath(source)):
+        # sorted, so duplicate routes are reported deterministically
+        dirs.sort()
 
-    for base, _, filenames in os.walk(absp):
         if base.endswith('__pycache__'):
             continue
 
-        for filename in filenames:
-            if "." not in filename:
-                continue
-
+        for filename in sorted(filenames):
             fp: str = normalize(os.path.join(base, filename))
+            route = route_for(fp, source)
 
-            if only and not os.path.samefile(fp, only):
-                continue
-
-            ext: str = fp.split(".")[-1]
-
-            if ext in ("md", "py"):
-                route: str = fp[abspl:][len("/pages"):][:-3]
-                route = route[:-5] if route.endswith("/index") else (route + "/")
-
-                if not only and route in mapped:
-                    console.print(f"[red b]duplicate route {route}[/]")
-                    raise FileExistsError
-
-                if only:
-                    mapped["$new"] = {
-                        "route": route
-                    }
-
-                if ext == "md":
-                    with open(fp, "r", encoding="utf-8") as f:
-                        mapped[route] = {
-                            "type": "md",
-                            "file": fp,
-                            "ctnt": markdown2.markdown(
-                                f.read(),
-                                extras=["metadata", "spoiler"]
-                            )
-                        }
-
-                else:
-                    mod = load(fp)
-                    route = getattr(mod, "__route__", route)
-                    cnt = getattr(mod, "handle", None)
-
-                    if not cnt:
-                        console.print(
-                            f"[red b]Cannot find coro handle() for {route}[/] "
-                            f"[white d u]{fp}[/]"
-                        )
-                        raise AttributeError
-
-                    elif not iscoro(cnt):
-                        console.print(
-                            "[red b]export handle() is not coroutine[/]"
-                        )
-                        raise TypeError
-
-                    module_mapping[route] = mod
-
-                    mapped[route] = {
-                        "type": "py",
-                        "file": fp,
-                        "ctnt": "<load>"
-                    }
+            if route is not None:
+                entries.append((fp, route))
+
+    markdown = cache.render_files(
+        [fp for fp, _ in entries if fp.endswith(".md")],
+        processes=processes
+    )
+
+    for fp, route in entries:
+        if route in mapped:
+            console.print(f"[red b]duplicate route {escape(route)}[/]")
+            raise FileExistsError
+
+        route, entry, mod = map_page(fp, route, markdown.get(fp))
+        mapped[route] = entry
+
+        if mod is not None:
+            module_mapping[route] = mod
 
     if save:
-        with open("_pagable.cache", "wb") as f:
-            pickle.dump(mapped, f)
+        save_mapped(mapped)
+        cache.save()
 
     return mapped, module_mapping
 
 
+def save_mapped(mapping: Mapping):
+    """Saves a mapping to ``_pagable.cache``.
+
+    Args:
+        mapping (Mapping): The mapping.
+    """
+    with open("_pagable.cache", "wb") as f:
+        pickle.dump(mapping, f)
+
+
+def compile_routes(mapping: Mapping) -> RouteTable:
+    """Compiles a route table from a mapping.
+
+    Args:
+        mapping (Mapping): The mapping, from :func:`map_source`.
+
+    Returns:
+        RouteTable: The route table.
+    """
+    table = RouteTable()
+
+    for route in mapping:
+        if not route.startswith("$"):
+            table.add(route)
+
+    return table
+
+
 def get_mapped(*, expired_then_generate: bool = True) -> Mapping:
     """Gets previously generated mapping.
 
@@ -0,0 +1,259 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+MemoKey = Tuple[Hashable, ...]
+
+
+def is_pure(mod: Any) -> bool:
+    """Checks whether a page's renders only depend on its route and states.
+
+    Pages opt in with a module-level ``__pure__ = True``, or by decorating
+    ``handle()`` with :func:`pagable.pure`.
+
+    Args:
+        mod (Any): The page module.
+    """
+    return bool(
+        getattr(mod, "__pure__", False)
+        or getattr(mod.handle, "__pure__", False)
+    )
+
+
+def is_shared(mod: Any) -> bool:
+    """Checks whether a page renders the same for every connection.
+
+    Pages opt in with a module-level ``__shared__ = True``, and may set
+    ``__ttl__`` (seconds) for time-dependent content.
+
+    Args:
+        mod (Any): The page module.
+    """
+    return bool(getattr(mod, "__shared__", False))
+
+
+class RenderMemo:
+    """Represents a bounded LRU of rendered content, shared by connections.
+
+    Entries are keyed by route, route parameters and the state snapshot the
+    render started from.
+
+    Args:
+        max_entries (int, optional): Maximum number of entries.
+    """
+    __slots__ = (
+        "max_entries",
+        "entries",
+        "hits",
+        "misses",
+    )
+    max_entries: int
+    # least recently used first
+    entries: "OrderedDict[MemoKey, Any]"
+    hits: int
+    misses: int
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def key(
+        self,
+        route: str,
+        params: Dict[str, str],
+        states: Dict[str, Any]
+    ) -> Optional[MemoKey]:
+        """Gets the key of a render, or ``None`` if states aren't hashable.
+
+        Args:
+            route (str): The route.
+            params (Dict[str, str]): Route parameters.
+            states (Dict[str, Any]): The state snapshot.
+        """
+        key = (
+            route,
+            tuple(sorted(params.items())),
+            tuple(sorted(states.items())),
+        )
+
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
+
+    def get(self, key: MemoKey) -> Optional[Any]:
+        """Gets rendered content, if cached.
+
+        Args:
+            key (MemoKey): The key, from :meth:`key`.
+        """
+        content = self.entries.get(key)
+
+        if content is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return content
+
+    def put(self, key: MemoKey, content: Any):
+        """Puts rendered content, evicting the least recently used entry.
+
+        Args:
+            key (MemoKey): The key, from :meth:`key`.
+            content (Any): The rendered content. It's shared, so it must not
+                be modified afterwards.
+        """
+        self.entries[key] = content
+        self.entries.move_to_end(key)
+
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, route: str):
+        """Drops every entry of a route, e.g., when its source changed.
+
+        Args:
+            route (str): The route.
+        """
+        for key in [key for key in self.entries if key[0] == route]:
+            del self.entries[key]
+
+
+class SharedRender:
+    """Represents a render shared by every connection.
+
+    Attributes:
+        content (Any): The rendered content, or ``None`` if the page turned
+            out not to be shareable.
+        expires (float, optional): When it expires (``time.monotonic()``).
+        frames (Dict[bool, bytes]): Encoded render messages, by whether
+            they're the initial render of a connection.
+    """
+    __slots__ = (
+        "content",
+        "expires",
+        "frames",
+    )
+    content: Any
+    expires: Optional[float]
+    frames: Dict[bool, bytes]
+
+    def __init__(self, content: Any, expires: Optional[float] = None):
+        self.content = content
+        self.expires = expires
+        self.frames = {}
+
+
+class SharedRenders:
+    """Represents renders shared across connections, one per source version.
+
+    Concurrent connections asking for the same render wait for a single
+    one. Entries live until their route is invalidated, or their TTL ends.
+
+    Args:
+        max_entries (int, optional): Maximum number of entries.
+    """
+    __slots__ = (
+        "max_entries",
+        "entries",
+        "hits",
+        "misses",
+        "_inflight",
+    )
+    max_entries: int
+    # least recently used first
+    entries: "OrderedDict[MemoKey, SharedRender]"
+    hits: int
+    misses: int
+    _inflight: Dict[MemoKey, "asyncio.Task[SharedRender]"]
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+        self._inflight = {}
+
+    async def get(
+        self,
+        route: str,
+        params: Dict[str, str],
+        render: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Optional[SharedRender]:
+        """Gets the shared render of a route, rendering it if needed.
+
+        Args:
+            route (str): The route.
+            params (Dict[str, str]): Route parameters.
+            render: Renders the content; returns ``None`` if the page isn't
+                shareable.
+            ttl (float, optional): Seconds the render may be reused.
+
+        Returns:
+            Optional[SharedRender]: The render, or ``None`` if the page isn't
+                shareable.
+        """
+        key = (route, tuple(sorted(params.items())))
+        entry = self.entries.get(key)
+
+        if entry is not None and (
+            entry.expires is None or entry.expires > time.monotonic()
+        ):
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry if entry.content is not None else None
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fill(key, render, ttl))
+            self._inflight[key] = task
+
+        # a cancelled connection doesn't cancel the render for the others
+        entry = await asyncio.shield(task)
+        return entry if entry.content is not None else None
+
+    async def _fill(
+        self,
+        key: MemoKey,
+        render: Callable[[], Awaitable[Any]],
+        ttl: Optional[float]
+    ) -> SharedRender:
+        try:
+            content = await render()
+            entry = SharedRender(
+                content,
+                None if ttl is None else time.monotonic() + ttl
+            )
+
+            # not invalidated while rendering
+            if self._inflight.get(key) is asyncio.current_task():
+                self.entries[key] = entry
+                self.entries.move_to_end(key)
+
+                if len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+            return entry
+
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def invalidate(self, route: str):
+        """Drops the renders of a route, e.g., when its source changed.
+
+        Args:
+            route (str): The route.
+        """
+        for key in [key for key in self.entries if key[0] == route]:
+            del self.entries[key]
+
+        for key in [key for key in self._inflight if key[0] == route]:
+            del self._inflight[key]
@@ -0,0 +1,263 @@
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .broadcast import BroadcastStats
+
+# seconds
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+# bytes
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+)
+
+
+def label(value: str) -> str:
+    """Escapes a label value for the Prometheus text format."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+class Histogram:
+    """Represents a histogram with fixed buckets.
+
+    Args:
+        buckets (Tuple[float, ...]): Upper bounds, ascending.
+    """
+    __slots__ = (
+        "buckets",
+        "counts",
+        "sum",
+        "count",
+    )
+    buckets: Tuple[float, ...]
+    counts: List[int]  # per bucket, plus +Inf
+    sum: float
+    count: int
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def export(self, name: str, labels: str = "") -> List[str]:
+        """Exports the histogram in the Prometheus text format.
+
+        Args:
+            name (str): The metric name.
+            labels (str, optional): Labels, e.g., ``route="/"``.
+        """
+        sep = "," if labels else ""
+        lines = []
+        cumulative = 0
+
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(
+                f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}'
+            )
+
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        labels = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{labels} {self.sum}")
+        lines.append(f"{name}_count{labels} {self.count}")
+        return lines
+
+
+class Span:
+    """Represents a traced operation.
+
+    Attributes:
+        name (str): The operation: ``render``, ``scripting`` or ``reload``.
+        route (str, optional): The route, if any.
+        start (float): When it started (``time.time()``).
+        duration (float): How long it took, in seconds.
+    """
+    __slots__ = (
+        "name",
+        "route",
+        "start",
+        "duration",
+    )
+    name: str
+    route: Optional[str]
+    start: float
+    duration: float
+
+    def __init__(
+        self,
+        name: str,
+        route: Optional[str],
+        start: float,
+        duration: float
+    ):
+        self.name = name
+        self.route = route
+        self.start = start
+        self.duration = duration
+
+
+class Metrics:
+    """Represents the metrics of an app.
+
+    Apps without metrics don't create one at all, so the only cost left is
+    an ``is None`` check at each measured point.
+
+    Args:
+        tracing (bool, optional): Whether to keep a span for each operation.
+        max_spans (int, optional): Spans to keep (the most recent ones).
+        on_span (Callable[[Span], None], optional): Called with each span,
+            e.g., to export it to a tracing backend.
+    """
+    __slots__ = (
+        "render_seconds",
+        "payload_bytes",
+        "scripting_seconds",
+        "reload_seconds",
+        "connections",
+        "tracing",
+        "spans",
+        "on_span",
+    )
+    render_seconds: Dict[str, Histogram]
+    payload_bytes: Dict[str, Histogram]
+    scripting_seconds: Histogram
+    reload_seconds: Histogram
+    connections: int
+    tracing: bool
+    spans: Deque[Span]
+    on_span: Optional[Callable[[Span], None]]
+
+    def __init__(
+        self,
+        *,
+        tracing: bool = False,
+        max_spans: int = 1000,
+        on_span: Optional[Callable[[Span], None]] = None
+    ):
+        self.render_seconds = {}
+        self.payload_bytes = {}
+        self.scripting_seconds = Histogram(LATENCY_BUCKETS)
+        self.reload_seconds = Histogram(LATENCY_BUCKETS)
+        self.connections = 0
+        self.tracing = tracing
+        self.spans = deque(maxlen=max_spans)
+        self.on_span = on_span
+
+    def _trace(self, name: str, route: Optional[str], duration: float):
+        span = Span(name, route, time.time() - duration, duration)
+        self.spans.append(span)
+
+        if self.on_span is not None:
+            self.on_span(span)
+
+    def observe_render(self, route: str, seconds: float):
+        """Records a render, from start until it was sent.
+
+        Args:
+            route (str): The route.
+            seconds (float): The duration.
+        """
+        histogram = self.render_seconds.get(route)
+        if histogram is None:
+            histogram = Histogram(LATENCY_BUCKETS)
+            self.render_seconds[route] = histogram
+
+        histogram.observe(seconds)
+        if self.tracing:
+            self._trace("render", route, seconds)
+
+    def observe_payload(self, route: str, size: int):
+        """Records the size of a message sent to a connection.
+
+        Args:
+            route (str): The route.
+            size (int): The size, in bytes.
+        """
+        histogram = self.payload_bytes.get(route)
+        if histogram is None:
+            histogram = Histogram(SIZE_BUCKETS)
+            self.payload_bytes[route] = histogram
+
+        histogram.observe(size)
+
+    def observe_scripting(self, route: str, seconds: float):
+        """Records a scripting round trip.
+
+        Args:
+            route (str): The route.
+            seconds (float): The round trip time.
+        """
+        self.scripting_seconds.observe(seconds)
+        if self.tracing:
+            self._trace("scripting", route, seconds)
+
+    def observe_reload(self, route: Optional[str], seconds: float):
+        """Records a file reload.
+
+        Args:
+            route (str, optional): The affected route, if any.
+            seconds (float): The duration.
+        """
+        self.reload_seconds.observe(seconds)
+        if self.tracing:
+            self._trace("reload", route, seconds)
+
+    def export(self, broadcast: BroadcastStats) -> str:
+        """Exports the metrics in the Prometheus text format.
+
+        Args:
+            broadcast (BroadcastStats): Fan-out statistics.
+        """
+        lines = [
+            "# TYPE pagable_render_seconds histogram",
+        ]
+        for route, histogram in self.render_seconds.items():
+            lines += histogram.export(
+                "pagable_render_seconds", f'route="{label(route)}"'
+            )
+
+        lines.append("# TYPE pagable_payload_bytes histogram")
+        for route, histogram in self.payload_bytes.items():
+            lines += histogram.export(
+                "pagable_payload_bytes", f'route="{label(route)}"'
+            )
+
+        lines.append("# TYPE pagable_scripting_seconds histogram")
+        lines += self.scripting_seconds.export("pagable_scripting_seconds")
+        lines.append("# TYPE pagable_reload_seconds histogram")
+        lines += self.reload_seconds.export("pagable_reload_seconds")
+
+        lines += [
+            "# TYPE pagable_connections gauge",
+            f"pagable_connections {self.connections}",
+        ]
+
+        for name in ("emits", "deliveries", "dropped", "timeouts",
+                     "disconnects"):
+            lines += [
+                f"# TYPE pagable_broadcast_{name}_total counter",
+                f"pagable_broadcast_{name}_total {getattr(broadcast, name)}",
+            ]
+
+        lines += [
+            "# TYPE pagable_broadcast_latency_seconds_max gauge",
+            f"pagable_broadcast_latency_seconds_max {broadcast.latency_max}",
+            "# TYPE pagable_broadcast_latency_seconds_sum counter",
+            "pagable_broadcast_latency_seconds_sum "
+            f"{broadcast.latency_total}",
+        ]
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,125 @@
+import hashlib
+import importlib.util
+import os
+import re
+import sys
+from types import ModuleType
+from typing import Dict
+
+try:
+    import resource
+except ImportError:
+    resource = None # type: ignore
+
+PREFIX = "pagable_page"
+
+
+def module_name(route: str) -> str:
+    """Gets the stable module name of a page, derived from its route.
+
+    Args:
+        route (str): The route, as derived from the file path.
+    """
+    slug = re.sub(r"\W+", "_", route).strip("_") or "index"
+    digest = hashlib.sha1(route.encode()).hexdigest()[:8]
+    return f"{PREFIX}_{slug}_{digest}"
+
+
+def rss_kb() -> int:
+    """Gets the resident set size of this process, in KiB.
+
+    Falls back to the peak size where ``/proc`` isn't available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return 0
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, KiB elsewhere
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class ModuleRegistry:
+    """Represents the loaded page modules.
+
+    Each page is loaded under a stable name (see :func:`module_name`), so
+    loading it again replaces the previous version in ``sys.modules``
+    instead of adding another one.
+
+    Attributes:
+        modules (Dict[str, ModuleType]): Loaded modules, by file path.
+    """
+    __slots__ = (
+        "modules",
+    )
+    modules: Dict[str, ModuleType]
+
+    def __init__(self):
+        self.modules = {}
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def load(self, path: str, route: str) -> ModuleType:
+        """(Re)loads a page module.
+
+        If loading fails, the previous version stays loaded.
+
+        Args:
+            path (str): The file path.
+            route (str): The route, as derived from the file path.
+        """
+        name = module_name(route)
+        spec = importlib.util.spec_from_file_location(name, path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"cannot load {path!r}")
+
+        mod = importlib.util.module_from_spec(spec)
+        previous = sys.modules.get(name)
+        sys.modules[name] = mod
+
+        try:
+            spec.loader.exec_module(mod)
+
+        except BaseException:
+            if previous is not None:
+                sys.modules[name] = previous
+            else:
+                sys.modules.pop(name, None)
+
+            raise
+
+        self.modules[path] = mod
+        return mod
+
+    def unload(self, path: str):
+        """Unloads a page module, e.g., when its file is deleted.
+
+        Args:
+            path (str): The file path.
+        """
+        mod = self.modules.pop(path, None)
+        if mod is not None:
+            self._evict(mod)
+
+    def _evict(self, mod: ModuleType):
+        if sys.modules.get(mod.__name__) is mod:
+            del sys.modules[mod.__name__]
+
+    def stats(self) -> Dict[str, int]:
+        """Gets diagnostics: loaded modules and memory."""
+        return {
+            "page_modules": len(self.modules),
+            "sys_modules": len(sys.modules),
+            "rss_kb": rss_kb(),
+        }
+
+
+#: The registry of this process.
+registry = ModuleRegistry()
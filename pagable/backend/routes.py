@@ -0,0 +1,209 @@
+from typing import Dict, List, Optional, Tuple
+
+from rich.markup import escape
+
+from ._const import console
+
+Params = Dict[str, str]
+
+
+def is_dynamic(route: str) -> bool:
+    """Checks whether a route has parameter segments, e.g., ``/users/[id]/``.
+
+    Args:
+        route (str): The route.
+    """
+    return "[" in route
+
+
+def split(path: str) -> List[str]:
+    return [segment for segment in path.split("/") if segment]
+
+
+def normalize_path(path: str) -> str:
+    """Normalizes a request path into route form (``/a/b/``).
+
+    Args:
+        path (str): The path.
+    """
+    path = "/" + path.strip("/")
+    return path if path.endswith("/") else path + "/"
+
+
+class _Node:
+    __slots__ = (
+        "children",
+        "param",
+        "route",
+    )
+    children: Dict[str, "_Node"]
+    param: Optional["_Node"]
+    route: Optional[str]
+
+    def __init__(self):
+        self.children = {}
+        self.param = None
+        self.route = None
+
+
+class RouteTable:
+    """Represents a compiled route table.
+
+    Static routes resolve with a single dict lookup. Routes with parameter
+    segments (``[name]``) live in a trie, so resolving them depends on the
+    path depth rather than the number of pages. Static segments win over
+    parameters.
+
+    Attributes:
+        static (Dict[str, str]): Static routes.
+        names (Dict[str, List[str]]): Parameter names of each dynamic route.
+        frozen (bool): Whether routes can no longer be added or removed.
+    """
+    __slots__ = (
+        "static",
+        "names",
+        "frozen",
+        "_root",
+    )
+    static: Dict[str, str]
+    names: Dict[str, List[str]]
+    frozen: bool
+    _root: _Node
+
+    def __init__(self):
+        self.static = {}
+        self.names = {}
+        self.frozen = False
+        self._root = _Node()
+
+    def freeze(self) -> "RouteTable":
+        """Freezes the table; adding or removing routes then raises."""
+        self.frozen = True
+        return self
+
+    def _check_frozen(self):
+        if self.frozen:
+            raise RuntimeError("the route table is frozen")
+
+    def __contains__(self, route: str) -> bool:
+        return route in self.static or route in self.names
+
+    def add(self, route: str):
+        """Adds a route.
+
+        Args:
+            route (str): The route, e.g., ``/users/[id]/``.
+
+        Raises:
+            FileExistsError: Another route has the same shape, e.g.,
+                ``/users/[id]/`` and ``/users/[name]/``.
+        """
+        self._check_frozen()
+
+        if not is_dynamic(route):
+            self.static[route] = route
+            return
+
+        node = self._root
+        names = []
+
+        for segment in split(route):
+            if segment.startswith("[") and segment.endswith("]"):
+                names.append(segment[1:-1])
+                node.param = node.param or _Node()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, _Node())
+
+        if node.route is not None and node.route != route:
+            console.print(
+                f"[red b]route {escape(route)} conflicts with "
+                f"{escape(node.route)}[/]"
+            )
+            raise FileExistsError
+
+        node.route = route
+        self.names[route] = names
+
+    def remove(self, route: str):
+        """Removes a route, if present.
+
+        Args:
+            route (str): The route.
+        """
+        self._check_frozen()
+
+        if route in self.static:
+            del self.static[route]
+            return
+
+        if route not in self.names:
+            return
+
+        del self.names[route]
+        node: Optional[_Node] = self._root
+
+        for segment in split(route):
+            if node is None:
+                return
+
+            if segment.startswith("[") and segment.endswith("]"):
+                node = node.param
+            else:
+                node = node.children.get(segment)
+
+        # only if it wasn't taken over by another route
+        if node is not None and node.route == route:
+            node.route = None
+
+    def resolve(self, path: str) -> Optional[Tuple[str, Params]]:
+        """Resolves a request path.
+
+        Args:
+            path (str): The path, e.g., ``/users/42/``.
+
+        Returns:
+            Optional[Tuple[str, Params]]: The route and the extracted
+                parameters, or ``None`` if nothing matches.
+        """
+        path = normalize_path(path)
+
+        if path in self.static:
+            return path, {}
+
+        if not self.names:
+            return None
+
+        values: List[str] = []
+        route = self._match(self._root, split(path), 0, values)
+
+        if route is None:
+            return None
+
+        return route, dict(zip(self.names[route], values))
+
+    def _match(
+        self,
+        node: _Node,
+        segments: List[str],
+        index: int,
+        values: List[str]
+    ) -> Optional[str]:
+        if index == len(segments):
+            return node.route
+
+        child = node.children.get(segments[index])
+        if child is not None:
+            route = self._match(child, segments, index + 1, values)
+            if route is not None:
+                return route
+
+        if node.param is not None:
+            values.append(segments[index])
+            route = self._match(node.param, segments, index + 1, values)
+            if route is not None:
+                return route
+
+            values.pop()
+
+        return None
@@ -26,33 +26,194 @@ function addRequirement(requirement) {
     }
 }
 
-function parseMapping(mapping) {
+// common tags are sent as their index
+const TAGS = `${TAGS}`.split(",");
+
+// the websocket message encoding: json or msgpack
+const ENCODING = `${ENCODING}`;
+const decoder = new TextDecoder();
+let codec = null; // msgpack, loaded on demand
+
+async function loadCodec() {
+    if (ENCODING === "msgpack" && !codec)
+        codec = await import("https://jspm.dev/@msgpack/msgpack");
+}
+
+function decode(data) {
+    if (typeof data == 'string')
+        return JSON.parse(data);
+
+    return codec
+        ? codec.decode(new Uint8Array(data))
+        : JSON.parse(decoder.decode(data));
+}
+
+function encode(data) {
+    return codec ? codec.encode(data) : JSON.stringify(data);
+}
+
+function isElement(mapping) {
+    // elements are [tag, attrs, children]
+    return (
+        Array.isArray(mapping)
+        && mapping.length === 3
+        && typeof mapping[1] == 'object'
+        && mapping[1] !== null
+        && !Array.isArray(mapping[1])
+    );
+}
+
+function tagOf(element) {
+    const tag = element[0];
+    return typeof tag == 'number' ? TAGS[tag] : tag;
+}
+
+function parseMapping(mapping, nested = false) {
     if (typeof mapping == 'string') {
+        // text inside an element is a plain text node
+        if (nested)
+            return mapping
+                ? document.createTextNode(mapping)
+                : new DocumentFragment();
+
         let paragraph = document.createElement("p");
         paragraph.textContent = mapping;
         return paragraph;
 
+    } else if (isElement(mapping)) {
+        let element = document.createElement(tagOf(mapping));
+        element.appendChild(
+            parseMapping(mapping[2], true)
+        )
+        // attributes, as the server renders them (e.g., data-*)
+        for (const attr in mapping[1]) {
+            element.setAttribute(attr, mapping[1][attr])
+        }
+
+        return element
+
     } else if (Array.isArray(mapping)) {
         let fragment = new DocumentFragment();
 
         mapping.forEach((item) => {
             fragment.appendChild(
-                parseMapping(item)
+                parseMapping(item, nested)
             )
         })
 
         return fragment
+    }
+}
 
-    } else if (typeof mapping == 'object') {
-        let element = document.createElement(mapping.tag);
-        element.appendChild(
-            parseMapping(mapping.children)
-        )
-        for (const attr in mapping.attrs) {
-            element[attr] = mapping.attrs[attr]
+function flatten(mapping, nested) {
+    if (Array.isArray(mapping) && !isElement(mapping))
+        return mapping.flatMap((item) => flatten(item, nested));
+
+    if (nested && mapping === "")
+        return [];
+
+    return [mapping];
+}
+
+function sameTree(nodes, mapping, nested) {
+    // whether server-rendered DOM has the shape parseMapping would produce
+    const expected = flatten(mapping, nested);
+
+    if (nodes.length !== expected.length)
+        return false;
+
+    return expected.every((item, index) => {
+        const node = nodes[index];
+
+        if (typeof item == 'string') {
+            return (
+                node.nodeType === (nested ? Node.TEXT_NODE : Node.ELEMENT_NODE)
+                && node.textContent === item
+            );
         }
 
-        return element
+        return (
+            node.nodeType === Node.ELEMENT_NODE
+            && node.localName === tagOf(item).toLowerCase()
+            && sameAttributes(node, item[1])
+            && sameTree(node.childNodes, item[2], true)
+        );
+    })
+}
+
+function sameAttributes(node, attrs) {
+    const names = Object.keys(attrs);
+
+    return (
+        node.attributes.length === names.length
+        && names.every((name) => node.getAttribute(name) === attrs[name])
+    );
+}
+
+function setTheme(theme) {
+    if (document.getElementById("pagable-theme"))
+        return;
+
+    let sheet = document.createElement("link");
+    let themes = {
+        auto: "https://cdn.jsdelivr.net/npm/water.css@2/out/water.min.css",
+        light: "https://cdn.jsdelivr.net/npm/water.css@2/out/light.min.css",
+        dark: "https://cdn.jsdelivr.net/npm/water.css@2/out/dark.min.css"
+    };
+    sheet.id = "pagable-theme";
+    sheet.rel = "stylesheet";
+    sheet.href = themes[theme];
+    sheet.type = "text/css"
+    document.head.appendChild(sheet);
+}
+
+function nodeAt(root, path) {
+    let node = root;
+    path.forEach((index) => {
+        node = node.childNodes[index]
+    })
+
+    return node
+}
+
+function applyPatch(root, patch) {
+    const parent = nodeAt(root, patch.path.slice(0, -1));
+    const index = patch.path[patch.path.length - 1];
+
+    switch (patch.op) {
+        case "insert":
+            parent.insertBefore(
+                parseMapping(patch.node, patch.path.length > 1),
+                parent.childNodes[index] || null
+            )
+            break
+        case "remove":
+            parent.removeChild(parent.childNodes[index])
+            break
+        case "move": {
+            const target = nodeAt(root, patch.path);
+            const child = target.childNodes[patch.from];
+            target.removeChild(child)
+            target.insertBefore(child, target.childNodes[patch.to] || null)
+            break
+        }
+        case "replace":
+            parent.replaceChild(
+                parseMapping(patch.node, patch.path.length > 1),
+                parent.childNodes[index]
+            )
+            break
+        case "attr": {
+            const element = parent.childNodes[index];
+            if (patch.value === null)
+                element.removeAttribute(patch.name)
+            else
+                element.setAttribute(patch.name, patch.value)
+            break
+        }
+        case "text":
+            parent.childNodes[index].textContent = patch.value
+            break
     }
 }
 
@@ -61,46 +222,40 @@ function connect() {
 
     const _url = `wss://${window.location.hostname}${WS_URL}`
     const ws = new WebSocket(_url);
+    let stream = null; // chunks of a streamed render being hydrated
+    ws.binaryType = "arraybuffer";
     const root = document.getElementById("root");
 
     ws.onopen = () => {
         console.log("[pagable] connected")
         let path = window.location.pathname;
         ws.send(
-            JSON.stringify({
+            encode({
                 path: path.endsWith('/') ? path : (path + "/")
             })
         )
     }
 
     ws.onmessage = ({ data: plainData }) => {
-        const data = JSON.parse(plainData);
+        const data = decode(plainData);
 
         if (data.type == 1) {
-            if (!data.initial)
-                return window.location.reload();
+            // server-rendered content is kept if it matches
+            const hydrating = data.initial && root.hasAttribute("data-ssr");
+            root.removeAttribute("data-ssr");
 
-            // first call
             console.log("[pagable] call")
             console.table(data)
 
             if (data.ctyp == "md") {
-                root.innerHTML = data.ctnt;
+                if (!hydrating)
+                    root.innerHTML = data.ctnt;
 
                 if (
                     data.meta.theme && 
                     data.meta.theme.toLowerCase() !== "none"
                 ) {
-                    let sheet = document.createElement("link");
-                    let themes = {
-                        auto: "https://cdn.jsdelivr.net/npm/water.css@2/out/water.min.css",
-                        light: "https://cdn.jsdelivr.net/npm/water.css@2/out/light.min.css",
-                        dark: "https://cdn.jsdelivr.net/npm/water.css@2/out/dark.min.css"
-                    };
-                    sheet.rel = "stylesheet";
-                    sheet.href = themes[data.meta.theme.toLowerCase()];
-                    sheet.type = "text/css"
-                    document.head.appendChild(sheet);
+                    setTheme(data.meta.theme.toLowerCase());
                 }
 
                 if (data.meta.title) {
@@ -111,29 +266,75 @@ function connect() {
                     addRequirement(requirement)
                 })
 
-                root.appendChild(
+                if (data.stream) {
+                    // more chunks follow; server-rendered content is only
+                    // checked once they're all here
+                    stream = hydrating ? [data.ctnt] : null;
+
+                    if (!hydrating)
+                        root.replaceChildren(parseMapping(data.ctnt));
+                    return;
+                }
+
+                if (
+                    hydrating 
+                    && sameTree(root.childNodes, data.ctnt, false)
+                )
+                    return;
+
+                root.replaceChildren(
                     parseMapping(data.ctnt)
                 );
             }
 
+        } else if (data.type == 4) {
+            // a streamed chunk
+            if (data.done) {
+                if (stream && !sameTree(root.childNodes, stream, false))
+                    root.replaceChildren(parseMapping(stream));
+
+                stream = null;
+            } else if (stream) {
+                stream.push(data.ctnt);
+            } else {
+                root.appendChild(parseMapping(data.ctnt));
+            }
+
+        } else if (data.type == 3) {
+            // patches
+            data.ctnt.forEach((patch) => {
+                applyPatch(root, patch)
+            })
+
         } else if (data.type == 2) {
-            // script interaction
+            // script interaction (a list of scripts is a batch)
+            const forget = data.id === null;
+
             try {
-                let res = Function(
-                    data.ctnt
-                )()
+                let res = Array.isArray(data.ctnt)
+                    ? data.ctnt.map((script) => Function(script)() || null)
+                    : Function(data.ctnt)();
+
+                if (forget)
+                    return;
+
                 ws.send(
-                    JSON.stringify({
+                    encode({
                       type: 2,
+                      id: data.id,
                       ctnt: res || null // prevent undefined
                   })
                 )
 
             } catch (e) {
                 //throw e
+                if (forget)
+                    return console.error(e);
+
                 ws.send(
-                    JSON.stringify({
+                    encode({
                       type: 2.1, // error
+                      id: data.id,
                       mesg: e.message,
                       name: e.name || null,
                       caus: e.cause || null
@@ -143,10 +344,13 @@ function connect() {
         }
         
     }
-    ws.onclose = () => {
+    ws.onclose = ({ code }) => {
+        if (code === 4404)
+            return console.error("[pagable] page not found");
+
         setTimeout(() => {
             window.location.reload()
         }, 1000)
     }
 }
-connect();
+loadCodec().then(connect);
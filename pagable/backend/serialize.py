@@ -0,0 +1,196 @@
+import json
+from typing import TYPE_CHECKING, Any, Dict, Literal, Optional, Union
+
+from fastapi import WebSocketDisconnect
+
+from ..elements import Element
+
+try:
+    import orjson
+except ImportError:
+    orjson = None # type: ignore
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None # type: ignore
+
+if TYPE_CHECKING:
+    from .metrics import Metrics
+
+Encoding = Literal["json", "msgpack"]
+
+# common tags are sent as their index; ``script.js`` gets the same list
+TAGS = (
+    "div", "p", "span", "a", "button", "input", "label", "form", "img",
+    "ul", "ol", "li", "table", "thead", "tbody", "tr", "th", "td",
+    "h1", "h2", "h3", "h4", "h5", "h6", "strong", "em", "code", "pre",
+    "br", "hr", "section", "article", "header", "footer", "nav", "main",
+    "select", "option", "textarea", "small", "blockquote",
+)
+TAG_IDS: Dict[str, int] = {tag: index for index, tag in enumerate(TAGS)}
+
+
+def _default(obj: Any) -> list:
+    """Encodes an element as ``[tag, attrs, children]``.
+
+    ``tag`` is an index into :obj:`TAGS` when possible. ``children`` is either
+    a string or a list of strings and elements.
+    """
+    if not isinstance(obj, Element):
+        raise TypeError(f"cannot serialize {type(obj).__name__!r}")
+
+    children = obj.children
+
+    if isinstance(children, list):
+        children = [
+            item if isinstance(item, (Element, str)) else str(item)
+            for item in children
+        ]
+    elif isinstance(children, Element):
+        children = [children]
+    elif not isinstance(children, str):
+        children = str(children)
+
+    return [TAG_IDS.get(obj.tag, obj.tag), obj.attrs, children]
+
+
+def dumps(data: Any, encoding: Encoding = "json") -> bytes:
+    """Serializes a message, including element trees, in a single pass.
+
+    JSON uses ``orjson`` if it's installed, falling back to ``json`` for
+    trees too deep for it. ``msgpack`` supports up to 512 levels.
+
+    Args:
+        data (Any): The message.
+        encoding (Encoding, optional): ``json`` or ``msgpack``.
+
+    Returns:
+        bytes: The encoded message.
+    """
+    if encoding == "msgpack":
+        return msgpack.packb(data, default=_default) # type: ignore
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_default)
+        except orjson.JSONEncodeError as err:
+            # orjson stops at 254 levels (about 127 elements deep); the
+            # stdlib encoder only stops at the recursion limit
+            if "Recursion limit" not in str(err):
+                raise
+
+    return json.dumps(
+        data,
+        default=_default,
+        separators=(",", ":"),
+        ensure_ascii=False
+    ).encode()
+
+
+def loads(data: Union[bytes, str], encoding: Encoding = "json") -> Any:
+    """Deserializes a message. Text frames are always JSON.
+
+    Args:
+        data (bytes | str): The message.
+        encoding (Encoding, optional): ``json`` or ``msgpack``.
+    """
+    if isinstance(data, bytes) and encoding == "msgpack":
+        return msgpack.unpackb(data) # type: ignore
+
+    return json.loads(data)
+
+
+class Channel:
+    """Represents a websocket speaking the app's message encoding.
+
+    Messages are sent as binary frames; the client answers in kind.
+
+    Args:
+        ws (WebSocket): The (accepted) websocket.
+        encoding (Encoding, optional): ``json`` or ``msgpack``.
+        metrics (Metrics, optional): Where to record payload sizes and
+            scripting round trips, if anywhere.
+    """
+    __slots__ = (
+        "ws",
+        "encoding",
+        "route",
+        "metrics",
+    )
+    ws: Any
+    encoding: Encoding
+    route: str
+    metrics: Optional["Metrics"]
+
+    def __init__(
+        self,
+        ws: Any,
+        encoding: Encoding = "json",
+        metrics: Optional["Metrics"] = None
+    ):
+        self.ws = ws
+        self.encoding = encoding
+        self.route = ""
+        self.metrics = metrics
+
+    def encode(self, data: Union[dict, list]) -> bytes:
+        """Encodes a message, e.g., to send it to many connections.
+
+        Args:
+            data (dict | list): The message.
+        """
+        return dumps(data, self.encoding)
+
+    async def send(self, data: Union[dict, list]):
+        """Sends a message.
+
+        Args:
+            data (dict | list): The message.
+        """
+        await self.send_encoded(dumps(data, self.encoding))
+
+    async def send_encoded(self, data: bytes):
+        """Sends a message encoded with :meth:`encode`.
+
+        Args:
+            data (bytes): The encoded message.
+        """
+        if self.metrics is not None:
+            self.metrics.observe_payload(self.route, len(data))
+
+        await self.ws.send_bytes(data)
+
+    def observe_scripting(self, seconds: float):
+        """Records a scripting round trip, if metrics are enabled.
+
+        Args:
+            seconds (float): The round trip time.
+        """
+        if self.metrics is not None:
+            self.metrics.observe_scripting(self.route, seconds)
+
+    async def receive(self) -> Any:
+        """Receives a message.
+
+        Raises:
+            WebSocketDisconnect: The client disconnected.
+        """
+        message = await self.ws.receive()
+
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+
+        data = message.get("bytes")
+        return loads(
+            message["text"] if data is None else data,
+            self.encoding
+        )
+
+    async def close(self, code: int = 1000):
+        """Closes the websocket.
+
+        Args:
+            code (int, optional): The close code.
+        """
+        await self.ws.close(code=code)
@@ -0,0 +1,109 @@
+import re
+from html import escape
+from typing import Any, Dict, List, Optional
+
+from ..elements import Element
+from ._const import THEMES
+from .diff import children, normalize
+
+# elements that cannot have children in HTML
+VOID_ELEMENTS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+))
+
+ROOT = '<div id="root"></div>'
+
+
+def render_html(content: Any) -> str:
+    """Renders content (as returned by :obj:`Component`) to HTML.
+
+    The markup mirrors what ``parseMapping`` in ``script.js`` builds, so the
+    client can hydrate onto it.
+
+    Args:
+        content (Any): The rendered content.
+
+    Returns:
+        str: The HTML.
+    """
+    parts: List[str] = []
+
+    for node in normalize(content):
+        if isinstance(node, str):
+            parts.append(f"<p>{escape(node, quote=False)}</p>")
+        else:
+            _render_element(node, parts)
+
+    return "".join(parts)
+
+
+def _render_element(node: Element, parts: List[str]):
+    tag = node.tag
+    parts.append(f"<{tag}")
+
+    for name, value in node.attrs.items():
+        parts.append(f' {name}="{escape(value)}"')
+
+    parts.append(">")
+
+    if tag.lower() in VOID_ELEMENTS:
+        return
+
+    for child in children(node):
+        if isinstance(child, str):
+            parts.append(escape(child, quote=False))
+        else:
+            _render_element(child, parts)
+
+    parts.append(f"</{tag}>")
+
+
+def inject(
+    template: str,
+    body: str,
+    meta: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """Injects rendered HTML into the ``#root`` of the ``index.html`` template.
+
+    Args:
+        template (str): The template.
+        body (str): The rendered HTML.
+        meta (Dict[str, str], optional): Markdown frontmatter. ``title`` and
+            ``theme`` are applied to the head.
+
+    Returns:
+        Optional[str]: The page, or ``None`` if the template has no empty
+            ``#root`` to render into.
+    """
+    if ROOT not in template:
+        return None
+
+    page = template.replace(
+        ROOT,
+        f'<div id="root" data-ssr>{body}</div>',
+        1
+    )
+    meta = meta or {}
+    title = meta.get("title")
+    theme = (meta.get("theme") or "none").lower()
+
+    if title:
+        page = re.sub(
+            r"<title>.*?</title>",
+            lambda _: f"<title>{escape(title)}</title>",
+            page,
+            count=1,
+            flags=re.S
+        )
+
+    if theme in THEMES:
+        page = page.replace(
+            "</head>",
+            '<link id="pagable-theme" rel="stylesheet" type="text/css" '
+            f'href="{THEMES[theme]}">\n</head>',
+            1
+        )
+
+    return page
+
@@ -0,0 +1,507 @@
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from stat import S_ISREG
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# don't bother compressing tiny bodies
+MIN_COMPRESS_SIZE = 256
+
+# public files up to this size are kept in memory once read
+MAX_CACHED_SIZE = 256 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# precompressed siblings, e.g., app.js.br next to app.js
+PRECOMPRESSED = {".br": "br", ".gz": "gzip"}
+
+# content-hashed names, as the build writes them, e.g., app.3f9a2c1b7e.js;
+# all-digit runs are more likely dates or timestamps, so they're revalidated
+HASHED_NAME = re.compile(r"\.(?=\d*[a-f])[0-9a-f]{10}\.\w+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def make_etag(body: bytes, suffix: str = "") -> str:
+    """Makes a strong ETag for a body.
+
+    Args:
+        body (bytes): The body.
+        suffix (str, optional): A suffix, e.g., for compressed variants.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}{suffix}"'
+
+
+def accepts(accept_encoding: str, coding: str) -> bool:
+    """Checks whether an ``Accept-Encoding`` header allows a content coding.
+
+    Args:
+        accept_encoding (str): The header value.
+        coding (str): The content coding, e.g., ``gzip``.
+    """
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+
+        if name.strip().lower() not in (coding, "*"):
+            continue
+
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        return quality > 0
+
+    return False
+
+
+def pick(codings: Iterable[str], accept_encoding: Optional[str]) -> str:
+    """Picks the best content coding for an ``Accept-Encoding`` header.
+
+    Args:
+        codings (Iterable[str]): The available content codings.
+        accept_encoding (str, optional): The header value.
+
+    Returns:
+        str: The content coding; ``identity`` if none is acceptable.
+    """
+    if accept_encoding:
+        for coding in ("br", "gzip"):
+            if coding in codings and accepts(accept_encoding, coding):
+                return coding
+
+    return "identity"
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parses a ``Range`` header.
+
+    Only single byte ranges are supported; for anything else, the whole body
+    should be sent.
+
+    Args:
+        header (str): The header value, e.g., ``bytes=0-1023``.
+        size (int): The size of the body.
+
+    Returns:
+        Optional[Tuple[int, int]]: The first and last byte (inclusive).
+
+    Raises:
+        ValueError: The range can't be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = (part.strip() for part in spec.partition("-"))
+    if (
+        not sep
+        or not (first or last)
+        or (first and not first.isdigit())
+        or (last and not last.isdigit())
+    ):
+        # malformed ranges are ignored
+        return None
+
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+
+        if last and int(last) < start:
+            return None
+
+    else:
+        # the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+
+    return start, end
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Checks ``If-None-Match`` against an ETag.
+
+    Args:
+        request (Request): The request.
+        etag (str): The current (quoted) ETag.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+class StaticBody:
+    """Represents a response body that is prepared once and served from memory.
+
+    Compressed variants (gzip, and brotli if installed) are computed upfront.
+
+    Args:
+        body (bytes): The body.
+        media_type (str): The media type.
+        cache_control (str, optional): The ``Cache-Control`` header.
+    """
+    __slots__ = (
+        "media_type",
+        "cache_control",
+        "variants",
+    )
+    media_type: str
+    cache_control: str
+    variants: Dict[str, Tuple[bytes, str]]  # coding -> (body, etag)
+
+    def __init__(
+        self,
+        body: bytes,
+        media_type: str,
+        *,
+        cache_control: str = "no-cache"
+    ):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.variants = {"identity": (body, make_etag(body))}
+
+        if len(body) < MIN_COMPRESS_SIZE:
+            return
+
+        if brotli is not None:
+            self._add_variant("br", brotli.compress(body))
+
+        self._add_variant("gzip", gzip.compress(body, mtime=0))
+
+    def _add_variant(self, coding: str, compressed: bytes):
+        identity, _ = self.variants["identity"]
+
+        if len(compressed) < len(identity):
+            self.variants[coding] = (
+                compressed,
+                make_etag(identity, f"-{coding}")
+            )
+
+    def pick(self, accept_encoding: Optional[str]) -> str:
+        """Picks the best content coding for an ``Accept-Encoding`` header.
+
+        Args:
+            accept_encoding (str, optional): The header value.
+
+        Returns:
+            str: The content coding; ``identity`` if none is acceptable.
+        """
+        return pick(self.variants, accept_encoding)
+
+    def respond(self, request: Request) -> Response:
+        """Responds to a request, with ``304`` if the client is up to date.
+
+        Args:
+            request (Request): The request.
+        """
+        coding = self.pick(request.headers.get("accept-encoding"))
+        body, etag = self.variants[coding]
+        headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+        }
+
+        if len(self.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+
+        if not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+
+        return Response(body, media_type=self.media_type, headers=headers)
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def iter_file(
+    path: str,
+    start: int,
+    length: int
+) -> AsyncIterator[bytes]:
+    """Reads part of a file in chunks, off the event loop.
+
+    Args:
+        path (str): The file path.
+        start (int): The first byte.
+        length (int): The number of bytes.
+    """
+    f = await asyncio.to_thread(open, path, "rb")
+
+    try:
+        await asyncio.to_thread(f.seek, start)
+
+        while length > 0:
+            chunk = await asyncio.to_thread(f.read, min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+
+            length -= len(chunk)
+            yield chunk
+
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+class StaticFile:
+    """Represents a file in ``public/``, as indexed at startup.
+
+    Precompressed siblings (``.br``, ``.gz``) are served to clients that
+    accept them. Files named with a build content hash are cached for good;
+    others are revalidated with their ETag, derived from size and mtime.
+    Small files are kept in memory once read.
+
+    Args:
+        path (str): The file path.
+        media_type (str): The media type.
+        variants (Dict[str, Tuple[str, int, str]]): The file and its
+            precompressed siblings: content coding -> (path, size, ETag).
+        cache_control (str): The ``Cache-Control`` header.
+    """
+    __slots__ = (
+        "path",
+        "media_type",
+        "variants",
+        "cache_control",
+        "cached",
+    )
+    path: str
+    media_type: str
+    variants: Dict[str, Tuple[str, int, str]]
+    cache_control: str
+    cached: Dict[str, bytes]  # coding -> body
+
+    def __init__(
+        self,
+        path: str,
+        media_type: str,
+        variants: Dict[str, Tuple[str, int, str]],
+        cache_control: str
+    ):
+        self.path = path
+        self.media_type = media_type
+        self.variants = variants
+        self.cache_control = cache_control
+        self.cached = {}
+
+    @classmethod
+    def from_path(cls, path: str) -> "StaticFile":
+        """Indexes a file and its precompressed siblings.
+
+        Args:
+            path (str): The file path.
+
+        Raises:
+            OSError: The file can't be read.
+        """
+        variants = {"identity": cls._stat(path)}
+
+        for suffix, coding in PRECOMPRESSED.items():
+            try:
+                variants[coding] = cls._stat(path + suffix, f"-{coding}")
+            except OSError:
+                pass
+
+        name = os.path.basename(path)
+        return cls(
+            path,
+            mimetypes.guess_type(name)[0] or "application/octet-stream",
+            variants,
+            IMMUTABLE if HASHED_NAME.search(name) else "no-cache"
+        )
+
+    @staticmethod
+    def _stat(path: str, suffix: str = "") -> Tuple[str, int, str]:
+        stat = os.stat(path)
+        if not S_ISREG(stat.st_mode):
+            raise IsADirectoryError(path)
+
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}{suffix}"'
+        return path, stat.st_size, etag
+
+    async def respond(self, request: Request) -> Response:
+        """Responds to a request; ``304`` if up to date, ``206`` for a range.
+
+        Args:
+            request (Request): The request.
+        """
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+
+        if range_header and if_range:
+            # the client's copy changed; send it whole
+            if if_range != self.variants["identity"][2]:
+                range_header = None
+
+        # ranges are served from the file itself, never a compressed one
+        coding = (
+            "identity" if range_header
+            else pick(self.variants, request.headers.get("accept-encoding"))
+        )
+        path, size, etag = self.variants[coding]
+        headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Accept-Ranges": "bytes",
+        }
+
+        if len(self.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+
+        if not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+
+        span = None
+        if range_header:
+            try:
+                span = parse_range(range_header, size)
+            except ValueError:
+                headers["Content-Range"] = f"bytes */{size}"
+                return Response(status_code=416, headers=headers)
+
+        if span is None:
+            return await self._send(coding, 0, size, 200, headers)
+
+        start, end = span
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return await self._send(coding, start, end - start + 1, 206, headers)
+
+    async def _send(
+        self,
+        coding: str,
+        start: int,
+        length: int,
+        status_code: int,
+        headers: Dict[str, str]
+    ) -> Response:
+        path, size, _ = self.variants[coding]
+
+        if size > MAX_CACHED_SIZE:
+            headers["Content-Length"] = str(length)
+            return StreamingResponse(
+                iter_file(path, start, length),
+                status_code=status_code,
+                headers=headers,
+                media_type=self.media_type
+            )
+
+        body = self.cached.get(coding)
+        if body is None:
+            body = self.cached[coding] = await asyncio.to_thread(
+                read_file,
+                path
+            )
+
+        return Response(
+            body[start:start + length],
+            status_code=status_code,
+            headers=headers,
+            media_type=self.media_type
+        )
+
+
+class PublicIndex:
+    """Represents an in-memory index of ``public/``.
+
+    Built at startup and kept current by the file watcher, so looking up a
+    file never touches the disk.
+
+    Args:
+        root (str, optional): The directory.
+    """
+    __slots__ = (
+        "root",
+        "files",
+    )
+    root: str
+    files: Dict[str, StaticFile]  # URL path -> file
+
+    def __init__(self, root: str = "./public"):
+        self.root = os.path.abspath(root).replace("\\", "/")
+        self.files = {}
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def build(self) -> "PublicIndex":
+        """Indexes every file."""
+        self.files.clear()
+
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                self.refresh(os.path.join(directory, name))
+
+        return self
+
+    def get(self, path: str) -> Optional[StaticFile]:
+        """Gets a file by its URL path, e.g., ``css/app.css``.
+
+        Args:
+            path (str): The URL path.
+        """
+        return self.files.get(path.strip("/"))
+
+    def contains(self, filename: str) -> bool:
+        """Checks whether a file path is in the directory.
+
+        Args:
+            filename (str): The (absolute) file path.
+        """
+        return filename.replace("\\", "/").startswith(self.root + "/")
+
+    def refresh(self, filename: str):
+        """(Re)indexes a file that was added, changed or deleted.
+
+        Args:
+            filename (str): The file path.
+        """
+        key = os.path.relpath(filename, self.root).replace("\\", "/")
+        self._index(key)
+
+        root, suffix = os.path.splitext(key)
+        if suffix in PRECOMPRESSED and root in self.files:
+            # a precompressed sibling changed
+            self._index(root)
+
+        if key not in self.files:
+            # e.g., a deleted directory
+            for stale in [k for k in self.files if k.startswith(key + "/")]:
+                del self.files[stale]
+
+    def _index(self, key: str):
+        try:
+            self.files[key] = StaticFile.from_path(
+                os.path.join(self.root, key)
+            )
+        except OSError:
+            self.files.pop(key, None)
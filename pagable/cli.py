@@ -37,13 +37,23 @@ app = App()
 app.run()
 """
 
+USAGE = """Usage:
+  pagable create [dir]
+  pagable build [out]"""
+
 def main():
     args = sys.argv[1:]
     
-    if not args or args[0] != 'create' or len(args) > 2:
-        print("Usage: pagable create [dir]")
+    if not args or args[0] not in ('create', 'build') or len(args) > 2:
+        print(USAGE)
         exit(0)
 
+    if args[0] == 'build':
+        from .backend.build import build
+
+        build("".join(args[1:]) or "./dist/")
+        return
+
     base = "".join(args[1:]) or os.path.join(os.getcwd(), "my-app")
     registers = (
         "src/api/",
@@ -8,6 +8,9 @@ BlankDict = {}
 class Element:
     """Represents an HTML element.
 
+    The tree is kept as-is (lazily) until it's serialized, which happens in a
+    single pass; see :attr:`nodes` and :attr:`mapping`.
+
     Args:
         tag (str): The initial HTML tag.
     """
@@ -15,15 +18,18 @@ class Element:
         'tag',
         'attrs',
         'children',
-        'attrs',
-        '_children'
     )
+    tag: str
+    attrs: Dict[str, str]
+    children: Union[Element, str, List[Element]]
 
     def __init__(
         self, 
         tag: str
     ) -> None:
         self.tag = tag
+        self.attrs = BlankDict
+        self.children = ""
 
     def __call__(
         self,
@@ -46,30 +52,37 @@ class Element:
             k.replace('_', '-'): str(v)
             for k, v in attrs_kwargs.items()
         }
-        self._init_children()
 
         return self
 
-    def _init_children(self):
+    @property
+    def nodes(self) -> List[Union[Element, str]]:
+        """Returns the children as a list of elements and strings."""
         if isinstance(self.children, List):
-            self._children = [
-                item.mapping if isinstance(item, Element) else str(item)
+            return [
+                item if isinstance(item, Element) else str(item)
                 for item in self.children
             ]
 
         elif isinstance(self.children, Element):
-            self._children = [self.children.mapping]
+            return [self.children]
 
-        else:
-            self._children = str(self.children)
+        return [str(self.children)]
 
     @property
     def mapping(self) -> dict:
-        """Returns a mapping for the JS client to understand."""
+        """Returns a mapping (as plain dicts) of this element's tree."""
         return {
             'tag': self.tag,
             'attrs': self.attrs,
-            'children': self._children
+            'children': (
+                [
+                    item.mapping if isinstance(item, Element) else item
+                    for item in self.nodes
+                ]
+                if isinstance(self.children, (List, Element))
+                else str(self.children)
+            )
         }
 
 class _HTML:
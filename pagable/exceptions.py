@@ -12,3 +12,7 @@ class PageError(Exception):
         super().__init__(
            page_error.format(**d)
         )
+
+class ConnectionRequired(Exception):
+    """Raised when a frontend API is used without a client connection, e.g.,
+    while pre-rendering a page on the server."""
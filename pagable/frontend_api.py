@@ -1,7 +1,7 @@
 import json
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 
-from .api import Component, get_component
+from .api import Batch, Component, get_component
 
 
 class FrontendAPI:
@@ -18,8 +18,29 @@ class FrontendAPI:
     def __init__(self):
         self.component = get_component()
 
-    async def _inject(self, script: str) -> Any:
-        return await self.component.add_scripting(script)
+    async def _inject(
+        self,
+        script: str,
+        *,
+        wait: bool = True,
+        decode: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        return await self.component.add_scripting(
+            script,
+            wait=wait,
+            decode=decode
+        )
+
+
+def _decode_item(d: Optional[str]) -> Optional[Union[str, Dict[Any, Any]]]:
+    if d is None:
+        return d
+
+    try:
+        return json.loads(d)
+
+    except json.JSONDecodeError:
+        return d
 
 
 class LocalStorage(FrontendAPI):
@@ -27,7 +48,10 @@ class LocalStorage(FrontendAPI):
 
     async def clear(self) -> None:
         """Clears the local storage."""
-        await self._inject("return window.localStorage.clear()")
+        await self._inject(
+            "return window.localStorage.clear()",
+            wait=False
+        )
 
     async def set_item(
         self, 
@@ -42,31 +66,27 @@ class LocalStorage(FrontendAPI):
         """
         data: str = value if isinstance(value, str) else json.dumps(value)
         await self._inject(
-            f"return window.localStorage.setItem({key!r}, {data!r})"
+            f"return window.localStorage.setItem({key!r}, {data!r})",
+            wait=False
         )
 
     async def get_item(
         self,
         key: str
-    ) -> Union[str, Dict[Any, Any]]:
+    ) -> Optional[Union[str, Dict[Any, Any]]]:
         """Gets an item from local storage.
 
         Args:
             key (str): The key.
 
         Returns:
-            str | Dict[Any, Any]: Returns dict if JSON detected.
-                String otherwise.
+            str | Dict[Any, Any] | None: Returns dict if JSON detected.
+                String otherwise. ``None`` if missing, or inside a batch.
         """
-        d: str = await self._inject(
-            f"return window.localStorage.getItem({key!r})"
+        return await self._inject(
+            f"return window.localStorage.getItem({key!r})",
+            decode=_decode_item
         )
-        
-        try:
-            return json.loads(d)
-
-        except json.JSONDecodeError:
-            return d
 
 class Script(FrontendAPI):
     """Represents a Javascript evaluator."""
@@ -107,13 +127,39 @@ class Navigator:
     """Represents the window navigator."""
 
 async def alert(*data: Any) -> None:
+    """Shows an alert on the frontend, without waiting for it."""
     script = Script()
-    await script.run(
+    await script._inject(
         "window.alert(" + ", ".join((
             f"{str(item)!r}" for item in data
-        )) + ")"
+        )) + ")",
+        wait=False
     )
 
+def batch(*, wait: bool = True) -> Batch:
+    """Coalesces the frontend API calls made inside the block into a single
+    round trip. Results are available as ``results`` after the block,
+    decoded the same way as outside of it.
+
+    Example:
+        .. code-block :: python
+
+            async def handle():
+                storage = LocalStorage()
+
+                async with batch() as b:
+                    await storage.set_item("theme", "dark")
+                    await storage.get_item("user")
+
+                _, user = b.results
+                ...
+
+    Args:
+        wait (bool, optional): Whether to wait for the results. Set to
+            ``False`` for fire-and-forget calls.
+    """
+    return get_component().batch(wait=wait)
+
 async def Window(): # noqa
     """Fetches the window object.
 